@@ -679,22 +679,27 @@ def refresh_lot_metrics(db: Session, lot_id: int) -> schemas.LotMetricsRead:
 
     # Track shares to infer coverage status
     shares_remaining = 0
+    shares_tracked = False
     for e in events:
-        fees = e.fees or 0.0
+        # WheelEvent has no share/fee columns yet; events without them count as zero
+        fees = getattr(e, "fees", None) or 0.0
         fees_total += fees
         et = e.event_type
         contracts = e.contracts or 0
-        qty = e.quantity_shares or 0
+        qty = getattr(e, "quantity_shares", None)
+        if qty is not None:
+            shares_tracked = True
+        qty = qty or 0
         if et in ("SELL_PUT_OPEN", "SELL_CALL_OPEN"):
             net_premiums += (e.premium or 0) * contracts * 100
         elif et in ("SELL_PUT_CLOSE", "SELL_CALL_CLOSE"):
             net_premiums -= (e.premium or 0) * contracts * 100
         elif et in ("BUY_SHARES", "ASSIGNMENT"):
-            stock_cost_total += (e.price or e.strike or 0) * qty
+            stock_cost_total += (getattr(e, "price", None) or e.strike or 0) * qty
             shares_remaining += qty
         elif et in ("SELL_SHARES", "CALLED_AWAY"):
             # realized component relative to effective basis calculated later; here treat as stock proceeds
-            stock_cost_total -= (e.price or e.strike or 0) * qty
+            stock_cost_total -= (getattr(e, "price", None) or e.strike or 0) * qty
             shares_remaining -= qty
 
     # Effective cost basis per lot (100 shares)
@@ -705,18 +710,21 @@ def refresh_lot_metrics(db: Session, lot_id: int) -> schemas.LotMetricsRead:
         cost_basis_effective = None
 
     lot.cost_basis_effective = cost_basis_effective
-    # Auto-fix coverage status: if shares < 100, lot cannot be covered
+    # Auto-fix coverage status: if shares < 100, lot cannot be covered.
+    # Only when some linked event carries a share quantity; otherwise shares_remaining
+    # is an unknown 0 and would strip the coverage a bind_call just set.
     try:
-        if shares_remaining < 100 and lot.status == "OPEN_COVERED":
-            lot.status = "OPEN_UNCOVERED"
-        # If exactly zero and there was a CALLED_AWAY event, prefer closed_called_away; otherwise leave as uncovered
-        if shares_remaining <= 0:
-            if any(e.event_type == "CALLED_AWAY" for e in events):
-                lot.status = "CLOSED_CALLED_AWAY"
-            else:
-                # Keep uncovered per product requirement rather than auto-closing as SOLD
-                if lot.status not in ("CLOSED_CALLED_AWAY", "CLOSED_SOLD"):
-                    lot.status = "OPEN_UNCOVERED"
+        if shares_tracked:
+            if shares_remaining < 100 and lot.status == "OPEN_COVERED":
+                lot.status = "OPEN_UNCOVERED"
+            # If exactly zero and there was a CALLED_AWAY event, prefer closed_called_away; otherwise leave as uncovered
+            if shares_remaining <= 0:
+                if any(e.event_type == "CALLED_AWAY" for e in events):
+                    lot.status = "CLOSED_CALLED_AWAY"
+                else:
+                    # Keep uncovered per product requirement rather than auto-closing as SOLD
+                    if lot.status not in ("CLOSED_CALLED_AWAY", "CLOSED_SOLD"):
+                        lot.status = "OPEN_UNCOVERED"
     except Exception as e:
         logger.warning("Lot status auto-fix failed for lot_id=%s: %s", lot_id, e)
     db.commit()
@@ -8,7 +8,7 @@ for use in other parts of the application.
 
 import os
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from typing import Generator
@@ -68,3 +68,23 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def warm_connection_pool(size: int = 5) -> None:
+    """
+    Open up to `size` pooled connections at startup so the first requests don't pay
+    the TCP/TLS handshake. The default of 5 matches QueuePool's default pool_size.
+    SQLite has no network handshake, so it is skipped.
+    """
+    if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        return
+    # Hold every connection until all are open so the pool really grows to `size`
+    connections = []
+    try:
+        for _ in range(size):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
@@ -152,10 +152,24 @@ if not _using_alembic:
     Base.metadata.create_all(bind=engine)
 
 
+# --- Warm the connection pool ---
+# Pay connection handshakes before serving traffic instead of on the first requests.
+from .database import warm_connection_pool
+try:
+    warm_connection_pool()
+except Exception as _e:
+    logger.warning("Connection pool warm-up failed (%s); connections will open on demand.", _e)
+
 # --- Ensure a default admin user exists ---
 from .startup_admin import ensure_default_admin
 ensure_default_admin()
 
+# --- Token encryption ---
+# Fernet is loaded on first token use; production validates the key at boot instead.
+if os.getenv("ENVIRONMENT", "development") == "production":
+    from .utils.crypto import warm_crypto
+    warm_crypto()
+
 # --- Routers ---
 from .routers import stocks, options, wheels, tickers, auth, users, importer, dashboard, schwab, portfolio_fast, portfolio, stocks_fast  # noqa: E402
 
@@ -31,6 +31,10 @@ logger = logging.getLogger(__name__)
 _oauth_state_store: Dict[str, Dict] = {}
 _OAUTH_STATE_TTL_SECONDS = 600  # 10 minutes
 
+# Schwab refresh tokens are valid for 7 days from issue; older stored ones are rejected
+# at decrypt time instead of being sent to Schwab for a refresh that cannot succeed
+_SCHWAB_REFRESH_TOKEN_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
 # Schwab API Configuration
 SCHWAB_CONFIG = {
     "auth_url": "https://api.schwabapi.com/v1/oauth/authorize",
@@ -42,6 +46,9 @@ SCHWAB_CONFIG = {
     "redirect_uri": os.getenv("SCHWAB_REDIRECT_URI", "https://allocraft-backend.onrender.com/schwab/callback")
 }
 
+# Where OAuth callbacks send the browser back to; read once like the settings above
+FRONTEND_URL = os.getenv("FRONTEND_URL", "https://allocraft.app")
+
 @router.get("/auth-url")
 async def get_auth_url(
     current_user: models.User = Depends(get_current_user)
@@ -79,41 +86,37 @@ async def oauth_callback(
     """Handle OAuth callback from Schwab"""
     if error:
         logger.error(f"OAuth error: {error}")
-        frontend_url = os.getenv("FRONTEND_URL", "https://allocraft.app")
         return RedirectResponse(
-            url=f"{frontend_url}/stocks?error={error}",
+            url=f"{FRONTEND_URL}/stocks?error={error}",
             status_code=302
         )
     
     if not code:
-        frontend_url = os.getenv("FRONTEND_URL", "https://allocraft.app")
         return RedirectResponse(
-            url=f"{frontend_url}/stocks?error=no_authorization_code",
+            url=f"{FRONTEND_URL}/stocks?error=no_authorization_code",
             status_code=302
         )
     
     if not state:
-        frontend_url = os.getenv("FRONTEND_URL", "https://allocraft.app")
         return RedirectResponse(
-            url=f"{frontend_url}/stocks?error=no_state_parameter",
+            url=f"{FRONTEND_URL}/stocks?error=no_state_parameter",
             status_code=302
         )
     
     try:
         # Validate CSRF state token.
-        frontend_url = os.getenv("FRONTEND_URL", "https://allocraft.app")
         state_entry = _oauth_state_store.pop(state, None)
         if state_entry is None:
             logger.warning("OAuth callback received unknown or already-used state token")
             return RedirectResponse(
-                url=f"{frontend_url}/stocks?error=invalid_state",
+                url=f"{FRONTEND_URL}/stocks?error=invalid_state",
                 status_code=302
             )
         age_seconds = (datetime.now(UTC) - state_entry["created_at"]).total_seconds()
         if age_seconds > _OAUTH_STATE_TTL_SECONDS:
             logger.warning("OAuth callback state token expired (%ds old)", int(age_seconds))
             return RedirectResponse(
-                url=f"{frontend_url}/stocks?error=state_expired",
+                url=f"{FRONTEND_URL}/stocks?error=state_expired",
                 status_code=302
             )
 
@@ -131,14 +134,13 @@ async def oauth_callback(
         
         # Redirect back to frontend with success
         return RedirectResponse(
-            url=f"{frontend_url}/stocks?schwab_connected=true",
+            url=f"{FRONTEND_URL}/stocks?schwab_connected=true",
             status_code=302
         )
     except Exception as e:
         logger.error(f"Token exchange failed: {e}")
-        frontend_url = os.getenv("FRONTEND_URL", "https://allocraft.app")
         return RedirectResponse(
-            url=f"{frontend_url}/stocks?error={str(e)}",
+            url=f"{FRONTEND_URL}/stocks?error={str(e)}",
             status_code=302
         )
 
@@ -199,7 +201,9 @@ async def get_user_schwab_token(db: Session, user: models.User) -> Optional[str]
     # Try to refresh the token if we have a refresh token
     if user.schwab_refresh_token:
         try:
-            tokens = await refresh_schwab_token(decrypt_token(user.schwab_refresh_token))
+            tokens = await refresh_schwab_token(
+                decrypt_token(user.schwab_refresh_token, max_age=_SCHWAB_REFRESH_TOKEN_MAX_AGE_SECONDS)
+            )
             await store_user_schwab_tokens(db, user, tokens)
             return tokens.get("access_token")
         except Exception as e:
@@ -160,6 +160,7 @@ def refresh_wheel_prices(db: Session = Depends(get_db)):
     try:
         from ..services.wheel_pnl_service import WheelPnLCalculator
         calculator = WheelPnLCalculator(db)
+        # Sync endpoint: the DB work runs in FastAPI's threadpool, quotes are batched by price_service
         result = calculator.refresh_all_wheel_pnl()
         return result
     except Exception as e:
@@ -8,7 +8,7 @@ class OptionsService:
     def refresh_option_prices(db: Session) -> dict:
         from ..models_unified import Position
         from ..services.price_service import fetch_option_contract_price
-        from ..utils.option_parser import parse_option_symbol
+        from ..utils.option_parser import parse_option_symbols
         from datetime import datetime, UTC
         option_positions = db.query(Position).filter(
             Position.asset_type == "OPTION",
@@ -19,9 +19,9 @@ class OptionsService:
         updated_count = 0
         failed_count = 0
         failed_symbols = []
-        for position in option_positions:
+        parsed_symbols = parse_option_symbols([p.symbol for p in option_positions])
+        for position, parsed in zip(option_positions, parsed_symbols):
             try:
-                parsed = parse_option_symbol(position.symbol)
                 if not parsed:
                     failed_count += 1
                     failed_symbols.append(f"{position.symbol}: Could not parse symbol")
@@ -84,15 +84,15 @@ class OptionsService:
     @staticmethod
     def read_options(db: Session) -> List[dict]:
         from ..models_unified import Position
-        from ..utils.option_parser import parse_option_symbol
+        from ..utils.option_parser import parse_option_symbols
         option_positions = db.query(Position).filter(
             Position.asset_type == "OPTION",
             Position.is_active == True
         ).all()
         options = []
-        for pos in option_positions:
+        parsed_symbols = parse_option_symbols([pos.symbol for pos in option_positions])
+        for pos, parsed in zip(option_positions, parsed_symbols):
             net_contracts = (pos.long_quantity or 0) - (pos.short_quantity or 0)
-            parsed = parse_option_symbol(pos.symbol)
             if parsed:
                 ticker = parsed['ticker']
                 option_type = parsed['option_type']
@@ -1,39 +1,98 @@
-from datetime import datetime, timedelta, UTC
 import os
 import threading
+import time
 import logging
 import requests
 import yfinance as yf
-from typing import Dict, Tuple, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
 TD_API_KEY = os.getenv("TWELVE_DATA_API_KEY", "")
 
+# Shared HTTP session for yfinance so connections and the Yahoo cookie/crumb
+# handshake are reused across Ticker objects instead of renegotiated per call.
+_yf_session = requests.Session()
+
 # --- Thread-safe in-memory caches (process-local) ---
-_cache_prices_td: Dict[str, Tuple[float, datetime]] = {}
-_cache_prices_yf: Dict[str, Tuple[float, datetime]] = {}
-_cache_ticker_info: Dict[str, Tuple[dict, datetime]] = {}
+# Entries are (value, time.monotonic() at insert). Each cache is an LRU
+# capped at CACHE_MAX_ENTRIES so arbitrary ticker lookups can't grow it forever.
+CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", "4096"))
+_cache_prices_td: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_cache_prices_yf: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_cache_ticker_info: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+# yfinance option chains keyed by (ticker, expiry_date); a chain holds every
+# strike, so this cache has its own, smaller cap
+OPTION_CHAIN_CACHE_MAX_ENTRIES = 256
+# Concurrent chain downloads in fetch_option_contract_prices
+OPTION_CHAIN_WORKERS = 16
+_cache_option_chains: "OrderedDict[Tuple[str, str], Tuple[object, float]]" = OrderedDict()
+
+# Striped locks: lookups for different symbols rarely share a stripe,
+# so concurrent requests for unrelated tickers don't serialize.
+_LOCK_STRIPES = 64
+_stripes = tuple(threading.Lock() for _ in range(_LOCK_STRIPES))
+
+def _lock(key: Hashable) -> threading.Lock:
+    return _stripes[hash(key) & (_LOCK_STRIPES - 1)]
 
-# Single reentrant lock guards all three caches
-_cache_lock = threading.RLock()
+# Tickers with a Twelve Data price request in flight, guarded by the stripe lock
+_inflight_td: Dict[str, threading.Event] = {}
+
+# TTLs (seconds)
+PRICE_TTL = 20.0
+OPTION_PRICE_TTL = 15.0
+TICKER_INFO_TTL = 6 * 60 * 60.0
+
+# The helpers below run under the key's stripe lock. Single OrderedDict
+# operations are atomic under the GIL, so a key evicted by another stripe
+# between calls is tolerated rather than locked against.
+def _cache_get(cache: OrderedDict, key: Hashable, ttl: float, now: float):
+    """Return the cached value for key if fresher than ttl, else None."""
+    hit = cache.get(key)
+    if hit is None or now - hit[1] >= ttl:
+        return None
+    try:
+        cache.move_to_end(key)
+    except KeyError:
+        pass
+    return hit[0]
 
-# TTLs
-PRICE_TTL = timedelta(seconds=20)
-TICKER_INFO_TTL = timedelta(hours=6)
+def _cache_put(cache: OrderedDict, key: Hashable, value, now: float, max_entries: Optional[int] = None) -> None:
+    """Insert value as most recently used, evicting the oldest entries past the cap."""
+    cache[key] = (value, now)
+    cache.move_to_end(key)
+    while len(cache) > (CACHE_MAX_ENTRIES if max_entries is None else max_entries):
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            break
 
 def fetch_latest_price(ticker: str) -> Optional[float]:
     """
     Fetch the latest price for a stock using the Twelve Data API.
     Returns a float or None. Caches for PRICE_TTL.
+    Concurrent misses for the same ticker share one outbound request: the first
+    caller fetches while the others wait for it and read the cache.
     """
-    now = datetime.now(UTC)
-    with _cache_lock:
-        hit = _cache_prices_td.get(ticker)
-        if hit and now - hit[1] < PRICE_TTL:
-            return hit[0]
-    if not TD_API_KEY:
-        return None
+    now = time.monotonic()
+    with _lock(ticker):
+        hit = _cache_get(_cache_prices_td, ticker, PRICE_TTL, now)
+        if hit is not None:
+            return hit
+        if not TD_API_KEY:
+            return None
+        event = _inflight_td.get(ticker)
+        leader = event is None
+        if leader:
+            event = threading.Event()
+            _inflight_td[ticker] = event
+    if not leader:
+        event.wait(timeout=6)
+        with _lock(ticker):
+            return _cache_get(_cache_prices_td, ticker, PRICE_TTL, time.monotonic())
     try:
         url = f"https://api.twelvedata.com/price?symbol={ticker}&apikey={TD_API_KEY}"
         response = requests.get(url, timeout=6)
@@ -43,11 +102,15 @@ def fetch_latest_price(ticker: str) -> Optional[float]:
         if price_raw is None:
             return None
         price = float(price_raw)
-        with _cache_lock:
-            _cache_prices_td[ticker] = (price, now)
+        with _lock(ticker):
+            _cache_put(_cache_prices_td, ticker, price, now)
         return price
     except Exception:
         return None
+    finally:
+        with _lock(ticker):
+            _inflight_td.pop(ticker, None)
+        event.set()
 
 def fetch_yf_price(ticker: str) -> Optional[float]:
     """
@@ -58,13 +121,13 @@ def fetch_yf_price(ticker: str) -> Optional[float]:
     4) history(period='5d').Close last
     Returns the price as a float, or None if not found.
     """
-    now = datetime.now(UTC)
-    with _cache_lock:
-        hit = _cache_prices_yf.get(ticker)
-        if hit and now - hit[1] < PRICE_TTL:
-            return hit[0]
+    now = time.monotonic()
+    with _lock(ticker):
+        hit = _cache_get(_cache_prices_yf, ticker, PRICE_TTL, now)
+        if hit is not None:
+            return hit
     try:
-        t = yf.Ticker(ticker)
+        t = yf.Ticker(ticker, session=_yf_session)
         # 1) fast_info
         price = None
         try:
@@ -105,25 +168,41 @@ def fetch_yf_price(ticker: str) -> Optional[float]:
         if price is None:
             return None
         val = float(price)
-        with _cache_lock:
-            _cache_prices_yf[ticker] = (val, now)
+        with _lock(ticker):
+            _cache_put(_cache_prices_yf, ticker, val, now)
         return val
     except Exception:
         return None
 
-def fetch_option_contract_price(ticker: str, expiry_date: str, option_type: str, strike_price: float) -> float:
+def fetch_option_chain(ticker: str, expiry_date: str):
     """
-    Fetch the last price for a specific option contract using yfinance.
-    :param ticker: Underlying ticker symbol (e.g., 'AAPL')
-    :param expiry_date: Expiry date in 'YYYY-MM-DD' format
-    :param option_type: 'Call' or 'Put'
-    :param strike_price: Strike price as float
-    :return: Last price of the option contract, or None if not found
+    Fetch the full yfinance option chain (calls and puts) for one expiry.
+    One HTTP call covers every strike, so callers pricing several contracts on
+    the same (ticker, expiry) should share it. Cached for OPTION_PRICE_TTL.
+    Returns None on failure; failures are not cached.
     """
+    key = (ticker, expiry_date)
+    now = time.monotonic()
+    with _lock(key):
+        hit = _cache_get(_cache_option_chains, key, OPTION_PRICE_TTL, now)
+        if hit is not None:
+            return hit
+    try:
+        chain = yf.Ticker(ticker, session=_yf_session).option_chain(expiry_date)
+    except Exception as e:
+        logger.debug("Error fetching option chain for %s %s: %s", ticker, expiry_date, e)
+        return None
+    with _lock(key):
+        _cache_put(_cache_option_chains, key, chain, now, OPTION_CHAIN_CACHE_MAX_ENTRIES)
+    return chain
+
+def clear_option_price_cache() -> None:
+    """Drop every cached option chain, so the next contract quotes are fetched fresh."""
+    _cache_option_chains.clear()
+
+def _contract_price_from_chain(chain, option_type: str, strike_price: float) -> Optional[float]:
+    """Last price for one strike of a fetched chain, or None if the strike isn't listed."""
     try:
-        yf_ticker = yf.Ticker(ticker)
-        # Get the option chain for the given expiry date
-        chain = yf_ticker.option_chain(expiry_date)
         # Select calls or puts DataFrame based on option_type
         options_df = chain.calls if option_type.lower() == "call" else chain.puts
         # Find the row with the exact strike price
@@ -131,42 +210,117 @@ def fetch_option_contract_price(ticker: str, expiry_date: str, option_type: str,
         if not row.empty:
             return float(row.iloc[0]['lastPrice'])
     except Exception as e:
-        logger.debug("Error fetching option price for %s: %s", ticker, e)
+        logger.debug("Error reading option price from chain: %s", e)
     return None
 
+def fetch_option_contract_price(ticker: str, expiry_date: str, option_type: str, strike_price: float) -> Optional[float]:
+    """
+    Fetch the last price for a specific option contract using yfinance.
+    :param ticker: Underlying ticker symbol (e.g., 'AAPL')
+    :param expiry_date: Expiry date in 'YYYY-MM-DD' format
+    :param option_type: 'Call' or 'Put'
+    :param strike_price: Strike price as float
+    :return: Last price of the option contract, or None if not found
+    Contracts on the same (ticker, expiry) share one cached chain download.
+    """
+    chain = fetch_option_chain(ticker, expiry_date)
+    if chain is None:
+        return None
+    return _contract_price_from_chain(chain, option_type, strike_price)
+
+def fetch_option_contract_prices(contracts: List[Tuple[str, str, str, float]]) -> List[Optional[float]]:
+    """
+    Batch variant of fetch_option_contract_price.
+    :param contracts: (ticker, expiry_date, option_type, strike_price) tuples
+    :return: Prices in the same order as contracts (None where not found)
+    Each distinct (ticker, expiry) chain is downloaded once; chains are fetched
+    concurrently on up to OPTION_CHAIN_WORKERS threads.
+    """
+    chain_keys = list(dict.fromkeys((ticker, expiry) for ticker, expiry, _, _ in contracts))
+    if not chain_keys:
+        return []
+    with ThreadPoolExecutor(max_workers=min(OPTION_CHAIN_WORKERS, len(chain_keys))) as executor:
+        chains = dict(zip(chain_keys, executor.map(lambda key: fetch_option_chain(*key), chain_keys)))
+    return [
+        None if chains[(ticker, expiry)] is None else _contract_price_from_chain(chains[(ticker, expiry)], option_type, strike)
+        for ticker, expiry, option_type, strike in contracts
+    ]
+
+def _ticker_info_from_quote(data: dict) -> dict:
+    """Map a Twelve Data quote object to our ticker-info shape ({} on error payloads)."""
+    # Twelve Data returns { "code": ..., "message": ... } on errors
+    if not data or data.get("code") is not None:
+        return {}
+    return {
+        "symbol": data.get("symbol"),
+        "name": data.get("name"),
+        "last_price": data.get("close"),
+        "change": data.get("change"),
+        "change_percent": data.get("percent_change"),
+        "volume": data.get("volume"),
+        "market_cap": None,
+        "timestamp": data.get("datetime"),
+    }
+
 def fetch_ticker_info(symbol: str) -> dict:
     """
     Fetch detailed information about a ticker symbol using Twelve Data's HTTP API.
     Returns a dictionary with ticker information. Caches for TICKER_INFO_TTL.
     Never raises; returns {} on failure or when no API key is configured.
     """
-    now = datetime.now(UTC)
-    with _cache_lock:
-        hit = _cache_ticker_info.get(symbol)
-        if hit and now - hit[1] < TICKER_INFO_TTL:
-            return hit[0]
+    now = time.monotonic()
+    with _lock(symbol):
+        hit = _cache_get(_cache_ticker_info, symbol, TICKER_INFO_TTL, now)
+        if hit is not None:
+            return hit
     if not TD_API_KEY:
         return {}
     try:
         url = f"https://api.twelvedata.com/quote?symbol={symbol}&apikey={TD_API_KEY}"
         resp = requests.get(url, timeout=6)
         resp.raise_for_status()
-        data = resp.json() or {}
-        # Twelve Data returns { "code": ..., "message": ... } on errors
-        if not data or data.get("code") is not None:
+        info = _ticker_info_from_quote(resp.json() or {})
+        if not info:
             return {}
-        info = {
-            "symbol": data.get("symbol"),
-            "name": data.get("name"),
-            "last_price": data.get("close"),
-            "change": data.get("change"),
-            "change_percent": data.get("percent_change"),
-            "volume": data.get("volume"),
-            "market_cap": None,
-            "timestamp": data.get("datetime"),
-        }
-        with _cache_lock:
-            _cache_ticker_info[symbol] = (info, now)
+        with _lock(symbol):
+            _cache_put(_cache_ticker_info, symbol, info, now)
         return info
     except Exception:
-        return {}
\ No newline at end of file
+        return {}
+
+def fetch_ticker_infos(symbols: List[str]) -> Dict[str, dict]:
+    """
+    Batch variant of fetch_ticker_info: cache misses are fetched with a single
+    Twelve Data batch quote request (symbol=A,B,C).
+    Returns {symbol: info}; symbols that could not be resolved map to {}.
+    Never raises.
+    """
+    now = time.monotonic()
+    results: Dict[str, dict] = {}
+    misses: List[str] = []
+    for symbol in dict.fromkeys(symbols):
+        with _lock(symbol):
+            hit = _cache_get(_cache_ticker_info, symbol, TICKER_INFO_TTL, now)
+        if hit is not None:
+            results[symbol] = hit
+        else:
+            results[symbol] = {}
+            misses.append(symbol)
+    if not misses or not TD_API_KEY:
+        return results
+    try:
+        url = f"https://api.twelvedata.com/quote?symbol={','.join(misses)}&apikey={TD_API_KEY}"
+        resp = requests.get(url, timeout=6)
+        resp.raise_for_status()
+        data = resp.json() or {}
+        # A single-symbol request returns the quote itself; batches are keyed by symbol
+        quotes = {misses[0]: data} if len(misses) == 1 else data
+        for symbol in misses:
+            info = _ticker_info_from_quote(quotes.get(symbol) or {})
+            if info:
+                with _lock(symbol):
+                    _cache_put(_cache_ticker_info, symbol, info, now)
+                results[symbol] = info
+    except Exception:
+        pass
+    return results
@@ -1,14 +1,34 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta, UTC
-import json
+from datetime import datetime, UTC
+import asyncio
 import logging
+import re
+import orjson
 from ..models import SchwabAccount, SchwabPosition, PositionSnapshot
 # from ..core.schwab_client import SchwabClient  # TODO: Implement when core module is created
 
 logger = logging.getLogger(__name__)
 
+# Matches either an MM/DD/YYYY expiration or a "$<strike>" token in option descriptions
+_OPTION_DESCRIPTION_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b|\$(\d+(?:\.\d+)?)(?![\d.,])")
+
+# Position fields already stored in their own SchwabPosition columns; they are
+# left out of raw_data so each row only keeps what the columns don't capture.
+_RAW_DATA_EXCLUDE = frozenset({
+    "longQuantity", "shortQuantity", "settledLongQuantity", "settledShortQuantity",
+    "marketValue", "averagePrice", "averageLongPrice", "averageShortPrice",
+    "currentDayProfitLoss", "currentDayProfitLossPercentage",
+    "longOpenProfitLoss", "shortOpenProfitLoss",
+})
+
+def _raw_position_data(position_data: Dict[str, Any]) -> str:
+    """Serialize the parts of a Schwab position payload not mapped to columns"""
+    return orjson.dumps(
+        {k: v for k, v in position_data.items() if k not in _RAW_DATA_EXCLUDE}
+    ).decode()
+
 class SchwabSyncService:
     def __init__(self, db: Session, schwab_client=None):  # Made schwab_client optional
         self.db = db
@@ -29,12 +49,28 @@ class SchwabSyncService:
                 "errors": []
             }
             
-            for account_summary in account_summaries:
-                account_result = await self.sync_account(
-                    account_summary["accountNumber"], 
-                    account_summary["hashValue"],
-                    force_refresh
-                )
+            # Overlap the Schwab API calls for all accounts. DB work inside
+            # sync_account runs without awaiting, so the shared session is
+            # never used by two accounts at once. Each account writes inside
+            # its own SAVEPOINT and everything is committed once below.
+            account_results = await asyncio.gather(
+                *[
+                    self.sync_account(
+                        account_summary["accountNumber"],
+                        account_summary["hashValue"],
+                        force_refresh,
+                        commit=False
+                    )
+                    for account_summary in account_summaries
+                ],
+                return_exceptions=True
+            )
+            self.db.commit()
+            
+            for account_summary, account_result in zip(account_summaries, account_results):
+                if isinstance(account_result, Exception):
+                    results["errors"].append(f"Account {account_summary['accountNumber']}: {str(account_result)}")
+                    continue
                 
                 # Aggregate results
                 results["accounts_synced"] += 1
@@ -48,13 +84,21 @@ class SchwabSyncService:
             
         except Exception as e:
             logger.error(f"Error during account sync: {str(e)}")
+            self.db.rollback()
             raise
     
-    async def sync_account(self, account_number: str, hash_value: str, force_refresh: bool = False) -> Dict[str, Any]:
-        """Sync a specific account and its positions"""
+    async def sync_account(
+        self, account_number: str, hash_value: str, force_refresh: bool = False, commit: bool = True
+    ) -> Dict[str, Any]:
+        """Sync a specific account and its positions.
+        
+        Writes happen inside SAVEPOINTs so a failure only discards this account's
+        changes. Pass commit=False to leave the final commit to the caller.
+        """
         try:
             # Check if we need to refresh
-            account = self.get_or_create_account(account_number, hash_value)
+            with self.db.begin_nested():
+                account = self.get_or_create_account(account_number, hash_value)
             
             if not force_refresh and self.is_recently_synced(account):
                 logger.info(f"Account {account_number} recently synced, skipping")
@@ -64,25 +108,28 @@ class SchwabSyncService:
             logger.info(f"Fetching positions for account {account_number}")
             account_details = await self.schwab_client.get_account_details(hash_value, fields="positions")
             
-            # Update account information
-            self.update_account_info(account, account_details)
-            
-            # Sync positions
-            positions_result = await self.sync_positions(account, account_details.get("securitiesAccount", {}).get("positions", []))
-            
-            # Create snapshot
-            self.create_position_snapshot(account)
-            
-            # Update last sync time
-            account.last_synced = datetime.now(UTC)
-            self.db.commit()
+            with self.db.begin_nested():
+                # Update account information
+                self.update_account_info(account, account_details)
+                
+                # Sync positions
+                positions_result = await self.sync_positions(account, account_details.get("securitiesAccount", {}).get("positions", []))
+                
+                # Create snapshot
+                self.create_position_snapshot(account)
+                
+                # Update last sync time
+                account.last_synced = datetime.now(UTC)
+            if commit:
+                self.db.commit()
             
             logger.info(f"Account {account_number} sync completed: {positions_result}")
             return positions_result
             
         except Exception as e:
             logger.error(f"Error syncing account {account_number}: {str(e)}")
-            self.db.rollback()
+            if commit:
+                self.db.rollback()
             return {"positions_updated": 0, "positions_added": 0, "positions_removed": 0, "errors": [str(e)]}
     
     def get_or_create_account(self, account_number: str, hash_value: str) -> SchwabAccount:
@@ -98,22 +145,20 @@ class SchwabSyncService:
                 hash_value=hash_value
             )
             self.db.add(account)
-            self.db.commit()
-            self.db.refresh(account)
+            self.db.flush()  # Get the account ID
         else:
             # Update hash value if changed
             if account.hash_value != hash_value:
                 account.hash_value = hash_value
-                self.db.commit()
+                self.db.flush()
         
         return account
     
-    def is_recently_synced(self, account: SchwabAccount, minutes: int = 5) -> bool:
-        """Check if account was synced recently"""
+    def is_recently_synced(self, account: SchwabAccount, threshold_sec: float = 300) -> bool:
+        """Check if account was synced within the last threshold_sec seconds"""
         if not account.last_synced:
             return False
-        threshold = datetime.now(UTC) - timedelta(minutes=minutes)
-        return account.last_synced > threshold
+        return (datetime.now(UTC) - account.last_synced).total_seconds() < threshold_sec
     
     def update_account_info(self, account: SchwabAccount, account_details: Dict[str, Any]):
         """Update account-level information"""
@@ -129,52 +174,64 @@ class SchwabSyncService:
     
     async def sync_positions(self, account: SchwabAccount, positions_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Sync positions for an account"""
-        current_symbols = set()
+        # Drop entries without a symbol up front so the prefetch below only
+        # hydrates the rows this payload can actually touch
+        positions_data = [
+            position_data for position_data in positions_data
+            if (position_data.get("instrument") or {}).get("symbol")
+        ]
+        current_symbols = {position_data["instrument"]["symbol"] for position_data in positions_data}
+        new_positions: Dict[str, SchwabPosition] = {}
         results = {"positions_updated": 0, "positions_added": 0, "positions_removed": 0, "errors": []}
         
-        for position_data in positions_data:
-            try:
-                instrument = position_data.get("instrument", {})
-                symbol = instrument.get("symbol")
-                
-                if not symbol:
-                    continue
-                
-                current_symbols.add(symbol)
-                
-                # Get or create position
-                position = self.db.query(SchwabPosition).filter(
+        # Load all matching active positions in one query instead of one per symbol
+        existing_positions: Dict[str, SchwabPosition] = {}
+        if current_symbols:
+            existing_positions = {
+                position.symbol: position
+                for position in self.db.query(SchwabPosition).filter(
                     and_(
                         SchwabPosition.account_id == account.id,
-                        SchwabPosition.symbol == symbol,
-                        SchwabPosition.is_active == True
+                        SchwabPosition.is_active == True,
+                        SchwabPosition.symbol.in_(current_symbols)
                     )
-                ).first()
+                )
+            }
+        
+        for position_data in positions_data:
+            symbol = position_data["instrument"]["symbol"]
+            try:
+                position = existing_positions.get(symbol) or new_positions.get(symbol)
                 
                 if position:
                     # Update existing position
                     self.update_position(position, position_data)
                     results["positions_updated"] += 1
-                    logger.debug(f"Updated position {symbol}")
+                    logger.debug("Updated position %s", symbol)
                 else:
                     # Create new position
-                    position = self.create_position(account.id, position_data)
+                    new_positions[symbol] = self.create_position(account.id, position_data)
                     results["positions_added"] += 1
-                    logger.debug(f"Added new position {symbol}")
+                    logger.debug("Added new position %s", symbol)
                 
             except Exception as e:
-                logger.error(f"Error processing position {position_data}: {str(e)}")
+                logger.error("Error processing position %s: %s", position_data, e)
                 results["errors"].append(f"Position {symbol}: {str(e)}")
         
+        # Insert all new positions in one batch instead of one unit-of-work add each
+        if new_positions:
+            self.db.bulk_save_objects(list(new_positions.values()))
+        
         # Mark positions not in current data as inactive
         inactive_count = self.mark_inactive_positions(account.id, current_symbols)
         results["positions_removed"] = inactive_count
         
-        self.db.commit()
+        # Flush pending updates so the snapshot aggregate sees them; the caller commits
+        self.db.flush()
         return results
     
     def create_position(self, account_id: int, position_data: Dict[str, Any]) -> SchwabPosition:
-        """Create a new position record"""
+        """Build a new position record; the caller is responsible for persisting it"""
         instrument = position_data.get("instrument", {})
         
         # Parse option details if applicable
@@ -189,19 +246,17 @@ class SchwabSyncService:
             option_type=option_details.get("option_type"),
             strike_price=option_details.get("strike_price"),
             expiration_date=option_details.get("expiration_date"),
-            raw_data=json.dumps(position_data)
+            raw_data=_raw_position_data(position_data)
         )
         
         self.update_position_values(position, position_data)
-        
-        self.db.add(position)
         return position
     
     def update_position(self, position: SchwabPosition, position_data: Dict[str, Any]):
         """Update existing position with new data"""
         self.update_position_values(position, position_data)
         position.last_updated = datetime.now(UTC)
-        position.raw_data = json.dumps(position_data)
+        position.raw_data = _raw_position_data(position_data)
     
     def update_position_values(self, position: SchwabPosition, position_data: Dict[str, Any]):
         """Update position values from Schwab data"""
@@ -234,42 +289,82 @@ class SchwabSyncService:
         symbol = instrument.get("symbol", "")
         description = instrument.get("description", "")
         
-        # Extract strike price from description
-        # Example: "NVIDIA CORP 09/19/2025 $230 Call"
-        if "$" in description:
+        # Fast path for the usual layout: "NVIDIA CORP 09/19/2025 $230 Call"
+        head, sep, tail = description.partition("$")
+        if sep:
             try:
-                strike_text = description.split("$")[1].split()[0]
-                details["strike_price"] = float(strike_text)
+                date_text = head.rsplit(None, 1)[-1]
+                if len(date_text) == 10 and date_text[2] == "/" and date_text[5] == "/":
+                    strike_price = float(tail.split(None, 1)[0])
+                    expiration_date = datetime(int(date_text[6:]), int(date_text[:2]), int(date_text[3:5]))
+                    details["strike_price"] = strike_price
+                    details["expiration_date"] = expiration_date
+                    return details
             except (IndexError, ValueError):
                 pass
         
-        # Extract expiration date from description
-        # Example: "NVIDIA CORP 09/19/2025 $230 Call"
-        try:
-            date_parts = description.split()
-            for part in date_parts:
-                if "/" in part and len(part) >= 8:  # MM/DD/YYYY format
-                    expiration_date = datetime.strptime(part, "%m/%d/%Y")
-                    details["expiration_date"] = expiration_date
-                    break
-        except (ValueError, IndexError):
-            pass
+        # Fall back to scanning for the expiration date and strike price independently
+        for match in _OPTION_DESCRIPTION_RE.finditer(description):
+            month, day, year, strike_text = match.groups()
+            if strike_text is not None:
+                details.setdefault("strike_price", float(strike_text))
+            elif "expiration_date" not in details:
+                try:
+                    details["expiration_date"] = datetime(int(year), int(month), int(day))
+                except ValueError:
+                    pass
         
         return details
     
     def mark_inactive_positions(self, account_id: int, current_symbols: set) -> int:
         """Mark positions not in current data as inactive"""
-        inactive_positions = self.db.query(SchwabPosition).filter(
+        # Single UPDATE; rowcount gives the number of deactivated positions
+        count = self.db.query(SchwabPosition).filter(
             and_(
                 SchwabPosition.account_id == account_id,
                 SchwabPosition.is_active == True,
                 ~SchwabPosition.symbol.in_(current_symbols)
             )
-        )
-        count = inactive_positions.count()
-        inactive_positions.update({"is_active": False, "last_updated": datetime.now(UTC)})
+        ).update({"is_active": False, "last_updated": datetime.now(UTC)}, synchronize_session=False)
         if count > 0:
             logger.info(f"Marked {count} positions as inactive")
         return count
     
-    # ...existing code...
\ No newline at end of file
+    def create_position_snapshot(self, account: SchwabAccount) -> PositionSnapshot:
+        """Record aggregate totals for the account's active positions"""
+        # One GROUP BY over active positions instead of loading and walking every row
+        rows = self.db.query(
+            SchwabPosition.asset_type,
+            func.count(SchwabPosition.id),
+            func.coalesce(func.sum(SchwabPosition.market_value), 0.0),
+            func.coalesce(func.sum(SchwabPosition.long_open_profit_loss + SchwabPosition.short_open_profit_loss), 0.0)
+        ).filter(
+            and_(
+                SchwabPosition.account_id == account.id,
+                SchwabPosition.is_active == True
+            )
+        ).group_by(SchwabPosition.asset_type).all()
+        
+        snapshot = PositionSnapshot(
+            account_id=account.id,
+            total_positions=0,
+            total_value=0.0,
+            total_profit_loss=0.0,
+            stock_count=0,
+            option_count=0,
+            stock_value=0.0,
+            option_value=0.0
+        )
+        for asset_type, count, value, profit_loss in rows:
+            snapshot.total_positions += count
+            snapshot.total_value += value
+            snapshot.total_profit_loss += profit_loss
+            if asset_type == "EQUITY":
+                snapshot.stock_count += count
+                snapshot.stock_value += value
+            elif asset_type == "OPTION":
+                snapshot.option_count += count
+                snapshot.option_value += value
+        
+        self.db.add(snapshot)
+        return snapshot
@@ -5,226 +5,318 @@ Schwab Data Transformation Service
 Transforms Schwab API JSON data (accounts, positions, orders, transactions)
 into Allocraft's internal models: stocks, options, wheels, cash balance, transactions, and orders.
 
-Input: Schwab JSON (as loaded from API or file)
+Input: Schwab JSON (as loaded from API or file, or the raw JSON bytes/str)
 Output: Allocraft ORM objects (Stock, Option, WheelCycle, etc.)
 """
 
-from typing import Any, Dict, List
-
-
-
-def transform_accounts(json_data: Any) -> List[Dict[str, Any]]:
-	"""Transform Schwab accounts JSON to Allocraft SchwabAccount dicts. Handles dict or list root."""
-	accounts = []
-	# If root is a dict with 'accounts', use it; if it's a list, treat as list of accounts
-	if isinstance(json_data, dict) and "accounts" in json_data:
-		account_list = json_data["accounts"]
-	elif isinstance(json_data, list):
-		account_list = json_data
-	else:
-		account_list = []
-	for acct in account_list:
-		account = {
-			"account_number": acct.get("accountNumber") or acct.get("accountId"),
-			"account_type": acct.get("type"),
-			"cash_balance": acct.get("cashBalance", 0.0),
-			"buying_power": acct.get("buyingPower", 0.0),
-			"total_value": acct.get("liquidationValue", 0.0),
-			"day_trading_buying_power": acct.get("dayTradingBuyingPower", 0.0),
-			"is_day_trader": acct.get("isDayTrader", False),
-			"raw_data": acct,
-		}
-		accounts.append(account)
-	return accounts
-
-
-
-def transform_positions(json_data: Any) -> List[Dict[str, Any]]:
-	"""Transform Schwab positions JSON to Allocraft Stock/Option dicts. Handles dict or list root."""
-	positions = []
-	# If root is a dict with 'accounts', use it; if it's a list, treat as list of accounts
-	if isinstance(json_data, dict) and "accounts" in json_data:
-		account_list = json_data["accounts"]
-	elif isinstance(json_data, list):
-		account_list = json_data
-	else:
-		account_list = []
-	for acct in account_list:
-		for pos in acct.get("positions", []):
-			asset_type = pos.get("assetType")
-			base = {
-				"symbol": pos.get("symbol"),
-				"asset_type": asset_type,
-				"quantity": pos.get("quantity", 0.0),
-				"cost_basis": pos.get("costBasis", 0.0),
-				"market_value": pos.get("marketValue", 0.0),
-				"long_quantity": pos.get("longQuantity", 0.0),
-				"short_quantity": pos.get("shortQuantity", 0.0),
-				"current_day_profit_loss": pos.get("currentDayProfitLoss", 0.0),
-				"current_day_profit_loss_percentage": pos.get("currentDayProfitLossPercentage", 0.0),
-				"raw_data": pos,
-			}
-			if asset_type == "OPTION":
-				base.update({
-					"underlying_symbol": pos.get("underlyingSymbol"),
-					"option_type": pos.get("putCall"),
-					"strike_price": pos.get("strikePrice"),
-					"expiration_date": pos.get("expirationDate"),
-					"option_deliverables": pos.get("optionDeliverables"),
-					"description": pos.get("description"),
-				})
-			positions.append(base)
-	return positions
-
-
-
-def transform_orders(json_data: Any) -> List[Dict[str, Any]]:
-	"""Transform Schwab orders JSON to Allocraft Order dicts. Handles dict or list root."""
-	orders = []
-	# If root is a dict with 'orders', use it; if it's a list, treat as list of orders
-	if isinstance(json_data, dict) and "orders" in json_data:
-		order_list = json_data["orders"]
-	elif isinstance(json_data, list):
-		order_list = json_data
-	else:
-		order_list = []
-	for order in order_list:
-		base = {
-			"order_id": order.get("orderId"),
-			"account_number": order.get("accountNumber"),
-			"order_type": order.get("orderType"),
-			"status": order.get("status"),
-			"entered_time": order.get("enteredTime"),
-			"close_time": order.get("closeTime"),
-			"price": order.get("price"),
-			"raw_data": order,
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+
+# Wheel-event keywords found in transaction descriptions. One case-insensitive
+# scan yields the set of keywords present; the lookahead keeps matching
+# zero-width so overlapping keywords are all reported, like substring checks.
+_WHEEL_KEYWORDS_RE = re.compile(
+	r"(?=(?:(?P<put>put)|(?P<call>call)|(?P<sell_to_open>sell to open)|(?P<buy_to_close>buy to close)"
+	r"|(?P<assigned>assign(?:ed|ment)|exercise)|(?P<bought>bought)|(?P<sold>sold)|(?P<expired>expired)))",
+	re.IGNORECASE,
+)
+
+# Actions that count as trade-direction keywords alongside the description ones
+_ACTION_KEYWORDS = {"sell": "action_sell", "buy": "action_buy"}
+
+# Ordered (required keywords, wheel_event) rules; the first rule whose keywords
+# are all present wins. A None label stops matching without tagging the row.
+_WHEEL_EVENT_RULES = (
+	(frozenset({"put", "sell_to_open"}), "put_sold_to_open"),
+	(frozenset({"put", "action_sell"}), "put_sold_to_open"),
+	(frozenset({"put", "buy_to_close"}), "put_bought_to_close"),
+	(frozenset({"put", "action_buy"}), "put_bought_to_close"),
+	(frozenset({"call", "sell_to_open"}), "call_sold_to_open"),
+	(frozenset({"call", "action_sell"}), "call_sold_to_open"),
+	(frozenset({"call", "buy_to_close"}), "call_bought_to_close"),
+	(frozenset({"call", "action_buy"}), "call_bought_to_close"),
+	(frozenset({"assigned", "put"}), "put_assigned"),
+	(frozenset({"assigned", "call"}), "call_assigned"),
+	(frozenset({"assigned"}), None),
+	(frozenset({"bought", "quantity_100"}), "stock_bought_100"),
+	(frozenset({"action_buy", "quantity_100"}), "stock_bought_100"),
+	(frozenset({"sold", "quantity_100"}), "stock_sold_100"),
+	(frozenset({"action_sell", "quantity_100"}), "stock_sold_100"),
+	(frozenset({"expired"}), "option_expired"),
+)
+
+
+# Schwab cash-movement transaction types; these never open, roll or close a
+# wheel, so classification skips them before scanning the description
+_NON_TRADE_ACTIONS = frozenset({
+	"ACH_RECEIPT", "ACH_DISBURSEMENT", "CASH_RECEIPT", "CASH_DISBURSEMENT",
+	"DIVIDEND_OR_INTEREST", "ELECTRONIC_FUND", "JOURNAL", "MARGIN_CALL",
+	"MEMORANDUM", "MONEY_MARKET", "SMA_ADJUSTMENT", "WIRE_IN", "WIRE_OUT",
+})
+
+
+# Wheel events that close the current cycle in transform_wheels
+_WHEEL_CYCLE_TERMINATORS = frozenset({"put_assigned", "call_assigned", "stock_sold_100", "option_expired"})
+
+
+def _intern(value: Any) -> Any:
+	"""Intern low-cardinality string values (asset types, put/call, actions) shared across many rows."""
+	return sys.intern(value) if type(value) is str else value
+
+
+def _unwrap(json_data: Any, key: str):
+	"""Return the record list from a Schwab payload: root[key] for dict roots, the root itself for list roots.
+	Raw JSON (bytes/str, e.g. a response body or file contents) is parsed with orjson first."""
+	if isinstance(json_data, (bytes, bytearray, memoryview, str)):
+		json_data = orjson.loads(json_data)
+	if isinstance(json_data, dict):
+		return json_data.get(key, ())
+	if isinstance(json_data, list):
+		return json_data
+	return ()
+
+
+def transform_accounts(json_data: Any, include_raw: bool = False) -> List[Dict[str, Any]]:
+	"""Transform Schwab accounts JSON to Allocraft SchwabAccount dicts. Handles dict or list root.
+	The source dict is kept under "raw_data" only when include_raw is True."""
+	account_list = _unwrap(json_data, "accounts")
+	return [_transform_account(acct, include_raw) for acct in account_list]
+
+
+def _transform_account(acct: Dict[str, Any], include_raw: bool) -> Dict[str, Any]:
+	g = acct.get
+	account = {
+		"account_number": g("accountNumber") or g("accountId"),
+		"account_type": g("type"),
+		"cash_balance": g("cashBalance", 0.0),
+		"buying_power": g("buyingPower", 0.0),
+		"total_value": g("liquidationValue", 0.0),
+		"day_trading_buying_power": g("dayTradingBuyingPower", 0.0),
+		"is_day_trader": g("isDayTrader", False),
+	}
+	if include_raw:
+		account["raw_data"] = acct
+	return account
+
+
+
+@dataclass(slots=True)
+class PositionRow:
+	"""One transformed Schwab position; option fields stay None for non-options."""
+	symbol: Optional[str]
+	asset_type: Optional[str]
+	quantity: float
+	cost_basis: float
+	market_value: float
+	long_quantity: float
+	short_quantity: float
+	current_day_profit_loss: float
+	current_day_profit_loss_percentage: float
+	underlying_symbol: Optional[str] = None
+	option_type: Optional[str] = None
+	strike_price: Optional[float] = None
+	expiration_date: Optional[str] = None
+	option_deliverables: Any = None
+	description: Optional[str] = None
+	raw_data: Optional[Dict[str, Any]] = None
+
+	def to_dict(self) -> Dict[str, Any]:
+		data = {
+			"symbol": self.symbol,
+			"asset_type": self.asset_type,
+			"quantity": self.quantity,
+			"cost_basis": self.cost_basis,
+			"market_value": self.market_value,
+			"long_quantity": self.long_quantity,
+			"short_quantity": self.short_quantity,
+			"current_day_profit_loss": self.current_day_profit_loss,
+			"current_day_profit_loss_percentage": self.current_day_profit_loss_percentage,
 		}
-		legs = []
-		for leg in order.get("orderLegCollection", []):
-			legs.append({
-				"order_leg_type": leg.get("orderLegType"),
-				"instrument": leg.get("instrument"),
-				"instruction": leg.get("instruction"),
-				"quantity": leg.get("quantity"),
-			})
-		base["order_legs"] = legs
-		orders.append(base)
-	return orders
+		if self.raw_data is not None:
+			data["raw_data"] = self.raw_data
+		if self.asset_type == "OPTION":
+			data["underlying_symbol"] = self.underlying_symbol
+			data["option_type"] = self.option_type
+			data["strike_price"] = self.strike_price
+			data["expiration_date"] = self.expiration_date
+			data["option_deliverables"] = self.option_deliverables
+			data["description"] = self.description
+		return data
+
+
+def transform_positions(json_data: Any, include_raw: bool = False) -> List[PositionRow]:
+	"""Transform Schwab positions JSON to Allocraft Stock/Option rows. Handles dict or list root.
+	Use PositionRow.to_dict() at API boundaries that need plain dicts.
+	The source dict is kept under "raw_data" only when include_raw is True."""
+	account_list = _unwrap(json_data, "accounts")
+	return [_transform_position(pos, include_raw) for acct in account_list for pos in acct.get("positions", ())]
+
+
+def _transform_position(pos: Dict[str, Any], include_raw: bool) -> PositionRow:
+	g = pos.get
+	asset_type = _intern(g("assetType"))
+	row = PositionRow(
+		g("symbol"),
+		asset_type,
+		g("quantity", 0.0),
+		g("costBasis", 0.0),
+		g("marketValue", 0.0),
+		g("longQuantity", 0.0),
+		g("shortQuantity", 0.0),
+		g("currentDayProfitLoss", 0.0),
+		g("currentDayProfitLossPercentage", 0.0),
+	)
+	if include_raw:
+		row.raw_data = pos
+	if asset_type == "OPTION":
+		row.underlying_symbol = g("underlyingSymbol")
+		row.option_type = _intern(g("putCall"))
+		row.strike_price = g("strikePrice")
+		row.expiration_date = g("expirationDate")
+		row.option_deliverables = g("optionDeliverables")
+		row.description = g("description")
+	return row
+
+
+
+def transform_orders(json_data: Any, include_raw: bool = False) -> List[Dict[str, Any]]:
+	"""Transform Schwab orders JSON to Allocraft Order dicts. Handles dict or list root.
+	The source dict is kept under "raw_data" only when include_raw is True."""
+	order_list = _unwrap(json_data, "orders")
+	return [_transform_order(order, include_raw) for order in order_list]
+
+
+def _transform_order(order: Dict[str, Any], include_raw: bool) -> Dict[str, Any]:
+	g = order.get
+	base = {
+		"order_id": g("orderId"),
+		"account_number": g("accountNumber"),
+		"order_type": g("orderType"),
+		"status": g("status"),
+		"entered_time": g("enteredTime"),
+		"close_time": g("closeTime"),
+		"price": g("price"),
+		"order_legs": [_transform_order_leg(leg) for leg in g("orderLegCollection", ())],
+	}
+	if include_raw:
+		base["raw_data"] = order
+	return base
 
 
+def _transform_order_leg(leg: Dict[str, Any]) -> Dict[str, Any]:
+	g = leg.get
+	return {
+		"order_leg_type": _intern(g("orderLegType")),
+		"instrument": g("instrument"),
+		"instruction": _intern(g("instruction")),
+		"quantity": g("quantity"),
+	}
 
 
-def transform_transactions(json_data: Any) -> List[Dict[str, Any]]:
-	"""Transform Schwab transactions JSON to Allocraft transaction dicts, tagging wheel-related events."""
-	transactions = []
+
+
+def transform_transactions(json_data: Any, include_raw: bool = False) -> List[Dict[str, Any]]:
+	"""Transform Schwab transactions JSON to Allocraft transaction dicts, tagging wheel-related events.
+	The source dict is kept under "raw_data" only when include_raw is True."""
+	return list(_iter_transactions(json_data, include_raw))
+
+
+def _iter_transactions(json_data: Any, include_raw: bool = False) -> Iterator[Dict[str, Any]]:
+	"""Lazily yield transformed transactions so callers can stream instead of building the full list."""
 	# Schwab format: { 'transactions': [ ... ] } or list root
-	if isinstance(json_data, dict) and "transactions" in json_data:
-		tx_list = json_data["transactions"]
-	elif isinstance(json_data, list):
-		tx_list = json_data
-	else:
-		tx_list = []
-	for tx in tx_list:
-		# Extract core fields
-		symbol = tx.get("symbol") or tx.get("underlyingSymbol")
-		action = tx.get("transactionType") or tx.get("action")
-		subcode = tx.get("subCode") or tx.get("subcode")
-		quantity = tx.get("quantity", 0)
-		description = tx.get("description", "")
-		amount = tx.get("amount", 0.0)
-		date = tx.get("transactionDate") or tx.get("date")
-		# Wheel event tagging logic
-		wheel_event = None
-		# Normalize action/description for robust matching
-		desc = description.lower()
-		act = (action or "").lower()
-		sub = (subcode or "").lower()
-		if ("put" in desc and "sell to open" in desc) or (act == "sell" and "put" in desc):
-			wheel_event = "put_sold_to_open"
-		elif ("put" in desc and "buy to close" in desc) or (act == "buy" and "put" in desc):
-			wheel_event = "put_bought_to_close"
-		elif ("call" in desc and "sell to open" in desc) or (act == "sell" and "call" in desc):
-			wheel_event = "call_sold_to_open"
-		elif ("call" in desc and "buy to close" in desc) or (act == "buy" and "call" in desc):
-			wheel_event = "call_bought_to_close"
-		elif "assigned" in desc or "assignment" in desc or "exercise" in desc:
-			if "put" in desc:
-				wheel_event = "put_assigned"
-			elif "call" in desc:
-				wheel_event = "call_assigned"
-		elif ("bought" in desc or act == "buy") and quantity == 100:
-			wheel_event = "stock_bought_100"
-		elif ("sold" in desc or act == "sell") and quantity == 100:
-			wheel_event = "stock_sold_100"
-		elif "expired" in desc:
-			wheel_event = "option_expired"
-		# Add more rules as needed
-		transactions.append({
-			"symbol": symbol,
-			"action": action,
-			"subcode": subcode,
-			"quantity": quantity,
-			"description": description,
-			"amount": amount,
-			"date": date,
-			"wheel_event": wheel_event,
-			"raw_data": tx
-		})
-	return transactions
-	"""Transform Schwab transactions JSON to Allocraft Transaction dicts. Handles dict or list root."""
-	txns = []
-	# If root is a dict with 'transactions', use it; if it's a list, treat as list of transactions
-	if isinstance(json_data, dict) and "transactions" in json_data:
-		txn_list = json_data["transactions"]
-	elif isinstance(json_data, list):
-		txn_list = json_data
-	else:
-		txn_list = []
-	for txn in txn_list:
-		txns.append({
-			"transaction_id": txn.get("transactionId"),
-			"account_number": txn.get("accountNumber"),
-			"type": txn.get("type"),
-			"amount": txn.get("amount"),
-			"date": txn.get("date"),
-			"description": txn.get("description"),
-			"raw_data": txn,
-		})
-	return txns
-
-
-def transform_wheels(json_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	for tx in _unwrap(json_data, "transactions"):
+		yield _transform_transaction(tx, include_raw)
+
+
+def _classify_wheel_event(description: str, action: Optional[str], quantity: Any) -> Optional[str]:
+	"""Return the wheel_event tag for a transaction, or None if it isn't a wheel event."""
+	if action in _NON_TRADE_ACTIONS:
+		return None
+	# Collect description keywords in one regex pass, add action/quantity
+	# keywords, then take the first matching rule
+	keywords = {m.lastgroup for m in _WHEEL_KEYWORDS_RE.finditer(description)}
+	action_keyword = _ACTION_KEYWORDS.get((action or "").lower())
+	if action_keyword:
+		keywords.add(action_keyword)
+	if quantity == 100:
+		keywords.add("quantity_100")
+	for needles, label in _WHEEL_EVENT_RULES:
+		if needles <= keywords:
+			return label
+	return None
+
+
+def _transform_transaction(tx: Dict[str, Any], include_raw: bool, wheel_event: Optional[str] = None) -> Dict[str, Any]:
+	# Extract core fields; callers that already classified the row pass its wheel_event
+	g = tx.get
+	symbol = _intern(g("symbol") or g("underlyingSymbol"))
+	action = _intern(g("transactionType") or g("action"))
+	subcode = _intern(g("subCode") or g("subcode"))
+	quantity = g("quantity", 0)
+	description = g("description", "")
+	amount = g("amount", 0.0)
+	date = g("transactionDate") or g("date")
+	if wheel_event is None:
+		wheel_event = _classify_wheel_event(description, action, quantity)
+	transaction = {
+		"symbol": symbol,
+		"action": action,
+		"subcode": subcode,
+		"quantity": quantity,
+		"description": description,
+		"amount": amount,
+		"date": date,
+		"wheel_event": wheel_event,
+	}
+	if include_raw:
+		transaction["raw_data"] = tx
+	return transaction
+
+
+def transform_wheels(json_data: Dict[str, Any], include_raw: bool = False) -> List[Dict[str, Any]]:
 	"""
 	Transform Schwab data to Allocraft WheelCycle and WheelEvent dicts.
 	Groups related option and stock trades into wheel cycles/events using wheel_event tags.
+	Event transactions carry "raw_data" only when include_raw is True.
 	"""
-	# Step 1: Get all transactions with wheel_event tags
-	transactions = transform_transactions(json_data)
+	# Classify raw rows first and build transaction dicts only for events kept in a cycle
 	cycles = []
 	current_cycle = None
+	current_symbol = None
+	append_event = None
 	cycle_id = 1
 
-	for tx in transactions:
-		we = tx.get("wheel_event")
+	for raw in _unwrap(json_data, "transactions"):
+		g = raw.get
+		we = _classify_wheel_event(g("description", ""), g("transactionType") or g("action"), g("quantity", 0))
+		if we is None:
+			continue
 		if we == "put_sold_to_open":
 			# Start a new wheel cycle
 			if current_cycle:
 				cycles.append(current_cycle)
+			tx = _transform_transaction(raw, include_raw, we)
+			current_symbol = tx["symbol"]
 			current_cycle = {
 				"cycle_id": cycle_id,
-				"symbol": tx["symbol"],
+				"symbol": current_symbol,
 				"events": [
 					{"type": we, "tx": tx}
 				],
 				"status": "Open"
 			}
+			append_event = current_cycle["events"].append
 			cycle_id += 1
-		elif current_cycle and we:
-			# Add event to current cycle if symbol matches
-			if tx["symbol"] == current_cycle["symbol"]:
-				current_cycle["events"].append({"type": we, "tx": tx})
+		elif current_cycle:
+			# Add event to current cycle if symbol matches (symbols are interned, so identity suffices)
+			if _intern(g("symbol") or g("underlyingSymbol")) is current_symbol:
+				append_event({"type": we, "tx": _transform_transaction(raw, include_raw, we)})
 				# End cycle on assignment, call away, or stock sale
-				if we in ("put_assigned", "call_assigned", "stock_sold_100", "option_expired"):
+				if we in _WHEEL_CYCLE_TERMINATORS:
 					current_cycle["status"] = "Closed"
 					cycles.append(current_cycle)
 					current_cycle = None
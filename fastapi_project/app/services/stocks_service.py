@@ -7,37 +7,44 @@ class StocksService:
     @staticmethod
     def upload_stock_csv(contents: bytes, db: Session) -> int:
         import csv, io
-        decoded = contents.decode("utf-8", errors="ignore").splitlines()
-        reader = csv.DictReader(decoded)
-        created = []
-        for raw_row in reader:
+        # Decode lazily while parsing instead of materializing the text and a list of lines
+        reader = csv.reader(io.TextIOWrapper(io.BytesIO(contents), encoding="utf-8", errors="ignore", newline=""))
+        header = next(reader, None)
+        if not header:
+            return 0
+        # Resolve normalized header names to column positions once for the whole file
+        col_idx = {name.strip().lower(): i for i, name in enumerate(header)}
+
+        def cell(row: List[str], name: str) -> str:
+            i = col_idx.get(name)
+            return row[i].strip() if i is not None and i < len(row) else ""
+
+        rows = []
+        for row in reader:
             try:
-                row = { (k or "").strip().lower(): (v or "").strip() for k, v in raw_row.items() }
-                ticker = row.get("ticker")
+                ticker = cell(row, "ticker")
                 if not ticker or ticker.lower() == "total":
                     continue
-                shares_str = row.get("shares")
-                cost_basis_str = row.get("cost_basis") or row.get("basis") or row.get("avg_cost") or row.get("average_cost")
+                shares_str = cell(row, "shares")
+                cost_basis_str = cell(row, "cost_basis") or cell(row, "basis") or cell(row, "avg_cost") or cell(row, "average_cost")
                 if not shares_str or not cost_basis_str:
                     continue
-                shares = float(shares_str)
-                cost_basis = float(cost_basis_str)
-                db_stock = models.Stock(
-                    ticker=ticker.upper(),
-                    shares=shares,
-                    cost_basis=cost_basis,
-                    market_price=None,
-                    status=row.get("status") or "Open",
-                    entry_date=row.get("entry_date") or row.get("date") or None,
-                    current_price=None,
-                    price_last_updated=None,
-                )
-                db.add(db_stock)
-                created.append(db_stock)
+                rows.append({
+                    "ticker": ticker.upper(),
+                    "shares": float(shares_str),
+                    "cost_basis": float(cost_basis_str),
+                    "market_price": None,
+                    "status": cell(row, "status") or "Open",
+                    "entry_date": cell(row, "entry_date") or cell(row, "date") or None,
+                    "current_price": None,
+                    "price_last_updated": None,
+                })
             except Exception:
                 continue
+        if rows:
+            db.bulk_insert_mappings(models.Stock, rows)
         db.commit()
-        return len(created)
+        return len(rows)
     @staticmethod
     def create_stock(db: Session, stock: 'schemas.StockCreate'):
         return crud.create_stock(db, stock)
@@ -77,29 +84,62 @@ class StocksService:
     def get_all_positions(db: Session) -> dict:
         from ..models_unified import Position, Account
         positions = []
-        all_positions = db.query(Position).filter(Position.is_active == True).all()
-        accounts = {acc.id: acc for acc in db.query(Account).all()}
+        # Project only the columns used below: plain Row tuples, no ORM identity-map work
+        all_positions = db.query(
+            Position.id,
+            Position.account_id,
+            Position.symbol,
+            Position.asset_type,
+            Position.long_quantity,
+            Position.short_quantity,
+            Position.average_price,
+            Position.market_value,
+            Position.current_day_profit_loss,
+            Position.data_source,
+            Position.status,
+            Position.underlying_symbol,
+            Position.option_type,
+            Position.strike_price,
+            Position.expiration_date,
+        ).filter(Position.is_active == True).all()
+        accounts = {
+            row.id: row
+            for row in db.query(Account.id, Account.account_type, Account.account_number, Account.brokerage).all()
+        }
+        # Summary counters are accumulated in the same pass that builds the rows
+        manual_count = schwab_count = option_count = 0
+        total_market_value = 0
         for pos in all_positions:
             account = accounts.get(pos.account_id)
             net_quantity = (pos.long_quantity or 0) - (pos.short_quantity or 0)
+            source = pos.data_source or "unknown"
+            is_option = pos.asset_type == "OPTION"
+            market_value = pos.market_value or 0
+            if source == "manual":
+                manual_count += 1
+            if "schwab" in source:
+                schwab_count += 1
+            if is_option:
+                option_count += 1
+            total_market_value += market_value
             position_data = {
                 "id": f"unified_{pos.id}",
                 "symbol": pos.symbol,
                 "shares": abs(net_quantity) if pos.asset_type in ["EQUITY", "COLLECTIVE_INVESTMENT"] else 0,
                 "costBasis": pos.average_price or 0,
-                "marketPrice": (pos.market_value or 0) / abs(net_quantity) if net_quantity != 0 else 0,
-                "marketValue": pos.market_value or 0,
+                "marketPrice": market_value / abs(net_quantity) if net_quantity != 0 else 0,
+                "marketValue": market_value,
                 "profitLoss": pos.current_day_profit_loss or 0,
-                "source": pos.data_source or "unknown",
+                "source": source,
                 "accountType": account.account_type if account else "Unknown",
                 "accountNumber": account.account_number if account else "Unknown",
                 "brokerage": account.brokerage if account else "Unknown",
-                "isOption": pos.asset_type == "OPTION",
+                "isOption": is_option,
                 "isShort": net_quantity < 0,
                 "assetType": pos.asset_type,
                 "status": pos.status
             }
-            if pos.asset_type == "OPTION":
+            if is_option:
                 position_data.update({
                     "underlyingSymbol": pos.underlying_symbol,
                     "optionType": pos.option_type,
@@ -112,11 +152,11 @@ class StocksService:
             "positions": positions,
             "summary": {
                 "total_positions": len(positions),
-                "manual_positions": len([p for p in positions if p["source"] == "manual"]),
-                "schwab_positions": len([p for p in positions if "schwab" in p["source"]]),
+                "manual_positions": manual_count,
+                "schwab_positions": schwab_count,
                 "accounts": len(accounts),
-                "equity_positions": len([p for p in positions if not p["isOption"]]),
-                "option_positions": len([p for p in positions if p["isOption"]]),
-                "total_market_value": sum(p["marketValue"] for p in positions),
+                "equity_positions": len(positions) - option_count,
+                "option_positions": option_count,
+                "total_market_value": total_market_value,
             }
         }
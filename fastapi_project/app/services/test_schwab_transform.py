@@ -1,5 +1,6 @@
-import json
 from pathlib import Path
+
+import orjson
 from schwab_transform_service import transform_accounts, transform_positions, transform_orders, transform_transactions
 
 # Paths to Schwab JSON samples
@@ -8,8 +9,7 @@ SCHWAB_JSON_DIR = Path("../../../../docs/development/import-page-schwab-json-imp
 # Helper to load JSON
 
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return orjson.loads(Path(path).read_bytes())
 
 def main():
     # Test accounts/positions
@@ -42,7 +42,7 @@ def main():
     print(f"Account Orders: {len(account_orders)}")
     print(f"Transactions: {len(transactions)}")
     print("Sample Account:", accounts[0] if accounts else None)
-    print("Sample Position:", positions[0] if positions else None)
+    print("Sample Position:", positions[0].to_dict() if positions else None)
     print("Sample Order:", orders[0] if orders else None)
     print("Sample Transaction:", transactions[0] if transactions else None)
 
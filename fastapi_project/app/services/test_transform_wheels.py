@@ -66,3 +66,21 @@ def test_transform_wheels_basic():
         # Should close on assignment or sale
         if cycle["status"] == "Closed":
             assert any(e["type"] in ("put_assigned", "stock_sold_100", "option_expired", "call_assigned") for e in cycle["events"])
+
+def test_transform_wheels_accepts_raw_json_bytes():
+    cycles = transform_wheels(json.dumps({"transactions": SAMPLE_TRANSACTIONS}).encode())
+    expected = transform_wheels(SAMPLE_TRANSACTIONS)
+    assert [(c["symbol"], c["status"], [e["type"] for e in c["events"]]) for c in cycles] == \
+        [(c["symbol"], c["status"], [e["type"] for e in c["events"]]) for c in expected]
+
+def test_transform_wheels_skips_cash_movements():
+    interest = {
+        "symbol": "AAPL",
+        "transactionType": "DIVIDEND_OR_INTEREST",
+        "description": "Interest expired put credit",
+        "quantity": 0,
+        "amount": 1.5,
+        "date": "2025-01-10",
+    }
+    cycles = transform_wheels(SAMPLE_TRANSACTIONS[:1] + [interest] + SAMPLE_TRANSACTIONS[1:])
+    assert cycles == transform_wheels(SAMPLE_TRANSACTIONS)
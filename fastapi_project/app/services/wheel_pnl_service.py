@@ -3,18 +3,135 @@ Wheel P&L Calculation Service
 Provides real-time P&L calculations for wheel strategies using current option market values
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime, UTC
-from sqlalchemy.orm import Session
-import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from datetime import date, datetime, UTC
+from sqlalchemy.orm import Session, load_only
 import logging
+import orjson
 
 from ..models import WheelCycle
-from ..services.price_service import fetch_option_contract_price
+from ..services.price_service import (
+    fetch_option_contract_price, fetch_option_contract_prices, fetch_yf_price
+)
 from ..utils.option_parser import parse_option_symbol
 
 logger = logging.getLogger(__name__)
 
+# (ticker, expiry_date, option_type, strike_price) for fetch_option_contract_price
+QuoteRequest = Tuple[str, str, str, float]
+
+# Option side sold by each wheel strategy; strategies not listed sell calls
+_OPTION_TYPE_BY_STRATEGY = {'cash_secured_put': 'Put'}
+
+# Shares controlled by one option contract
+CONTRACT_MULTIPLIER = 100
+
+# Failed cycles listed by name in the refresh summary
+MAX_REPORTED_FAILURES = 5
+
+# Open cycles streamed from the database per fetch/compute round
+REFRESH_BATCH_SIZE = 500
+
+
+@dataclass(slots=True)
+class PnLResult:
+    """Outcome of one wheel cycle P&L calculation; error is set on fallback results."""
+    success: bool
+    premium_collected: float
+    current_option_value: float
+    unrealized_pnl: float
+    total_pnl: float
+    current_option_price: Optional[float]
+    calculation_timestamp: str
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'success': self.success,
+            'premium_collected': self.premium_collected,
+            'current_option_value': self.current_option_value,
+            'unrealized_pnl': self.unrealized_pnl,
+            'total_pnl': self.total_pnl,
+            'current_option_price': self.current_option_price,
+            'calculation_timestamp': self.calculation_timestamp,
+        }
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+@dataclass
+class _RefreshTally:
+    """Running totals and pending row updates for a bulk P&L refresh."""
+    total: int = 0
+    updated: int = 0
+    failed: int = 0
+    failed_cycles: List[str] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@lru_cache(maxsize=1024)
+def _parse_metadata(raw: str) -> Dict[str, Any]:
+    """
+    Parse detection_metadata once per distinct string; callers treat the dict as read-only.
+    The strike is normalised to float here so the per-refresh path needn't cast it.
+    """
+    metadata = orjson.loads(raw)
+    strike_price = metadata.get('strike_price')
+    if strike_price is not None and type(strike_price) is not float:
+        metadata['strike_price'] = float(strike_price)
+    return metadata
+
+
+def _is_expired(expiry_date: str) -> bool:
+    """True once the expiration date (YYYY-MM-DD) is in the past; unparseable dates count as live."""
+    try:
+        return date.fromisoformat(str(expiry_date)[:10]) < datetime.now(UTC).date()
+    except ValueError:
+        return False
+
+
+def _intrinsic_value(ticker: str, option_type: str, strike_price: float) -> Optional[float]:
+    """
+    Closing value of an expired contract from the underlying's latest price.
+    Yahoo drops expired chains, so there is no contract quote to fetch.
+    """
+    spot = fetch_yf_price(ticker)
+    if spot is None:
+        return None
+    if option_type == 'Put':
+        return max(0.0, strike_price - spot)
+    return max(0.0, spot - strike_price)
+
+
+def _fetch_quote(request: QuoteRequest) -> Optional[float]:
+    ticker, expiry_date, option_type, strike_price = request
+    if _is_expired(expiry_date):
+        return _intrinsic_value(ticker, option_type, strike_price)
+    return fetch_option_contract_price(
+        ticker=ticker,
+        expiry_date=expiry_date,
+        option_type=option_type,
+        strike_price=strike_price
+    )
+
+
+def _unique_quote_requests(prepared: List[Tuple]) -> List[QuoteRequest]:
+    """Distinct quote requests in first-seen order; cycles on the same contract share one fetch."""
+    return list(dict.fromkeys(req for _, _, req in prepared if req is not None))
+
+
+def _fetch_quotes(requests: List[QuoteRequest]) -> Dict[QuoteRequest, Optional[float]]:
+    """Price a batch of quote requests: live contracts in one batched chain fetch, expired ones at intrinsic."""
+    live = [req for req in requests if not _is_expired(req[1])]
+    prices = dict(zip(live, fetch_option_contract_prices(live)))
+    for req in requests:
+        if req not in prices:
+            prices[req] = _intrinsic_value(req[0], req[2], req[3])
+    return prices
+
 
 class WheelPnLCalculator:
     """
@@ -30,6 +147,7 @@ class WheelPnLCalculator:
     def __init__(self, db: Session):
         self.db = db
         self.update_timestamp = datetime.now(UTC)
+        self.update_timestamp_iso = self.update_timestamp.isoformat()
     
     def calculate_wheel_pnl(self, cycle: WheelCycle) -> Dict[str, Any]:
         """
@@ -41,84 +159,121 @@ class WheelPnLCalculator:
         Returns:
             Dict containing P&L calculation results
         """
+        return self._calculate(cycle).to_dict()
+    
+    def _calculate(self, cycle: WheelCycle) -> PnLResult:
+        # Bound before the try so the fallback below works even if parsing fails
+        metadata = {}
         try:
-            # Parse detection metadata to get option details
-            metadata = json.loads(cycle.detection_metadata) if cycle.detection_metadata else {}
-            
-            # Extract option parameters
-            strike_price = metadata.get('strike_price')
-            expiration_date = metadata.get('expiration_date')
-            contract_count = metadata.get('contract_count', 1)
-            premium_per_share = metadata.get('premium', 0)
-            
-            if not all([strike_price, expiration_date, premium_per_share]):
-                logger.warning(f"Missing option parameters for wheel cycle {cycle.id}")
+            metadata, quote_request = self._prepare_cycle(cycle)
+            if quote_request is None:
                 return self._get_fallback_pnl(cycle, metadata)
+            current_option_price = _fetch_quote(quote_request)
+            return self._pnl_from_price(cycle, metadata, current_option_price)
             
-            # Calculate premium collected (what we received when selling the option)
-            premium_collected = premium_per_share * 100 * contract_count
-            
-            # Determine option type based on strategy
-            option_type = 'Put' if cycle.strategy_type == 'cash_secured_put' else 'Call'
-            
-            # Fetch current option market value
-            current_option_price = fetch_option_contract_price(
-                ticker=cycle.ticker,
-                expiry_date=expiration_date,
-                option_type=option_type,
-                strike_price=float(strike_price)
-            )
-            
-            if current_option_price is None:
-                logger.warning(f"Could not fetch current option price for {cycle.ticker}")
+        except Exception as e:
+            logger.error("Error calculating P&L for wheel cycle %s: %s", cycle.id, e)
+            return self._get_fallback_pnl(cycle, metadata)
+    
+    def _prepare_cycle(self, cycle: WheelCycle) -> Tuple[Dict, Optional[QuoteRequest]]:
+        """
+        Parse a cycle's detection metadata and build the option quote it needs.
+        
+        Returns:
+            (metadata, (ticker, expiration_date, option_type, strike_price)),
+            with None as the request when option parameters are missing
+        """
+        # Parse detection metadata to get option details
+        metadata = _parse_metadata(cycle.detection_metadata) if cycle.detection_metadata else {}
+        
+        # Extract option parameters
+        strike_price = metadata.get('strike_price')
+        expiration_date = metadata.get('expiration_date')
+        premium_per_share = metadata.get('premium')
+        
+        # Zero is a valid premium or strike; only absent values are missing
+        if strike_price is None or expiration_date is None or premium_per_share is None:
+            logger.warning("Missing option parameters for wheel cycle %s", cycle.id)
+            return metadata, None
+        
+        # Determine option type based on strategy
+        option_type = _OPTION_TYPE_BY_STRATEGY.get(cycle.strategy_type, 'Call')
+        
+        return metadata, (cycle.ticker, expiration_date, option_type, strike_price)
+    
+    def _pnl_for_quote(self, cycle: WheelCycle, metadata: Dict, quote_request: Optional[QuoteRequest],
+                       prices: Dict[QuoteRequest, Optional[float]]) -> PnLResult:
+        """
+        P&L for a prepared cycle using prices fetched in bulk; mirrors calculate_wheel_pnl's fallbacks.
+        """
+        try:
+            if quote_request is None:
                 return self._get_fallback_pnl(cycle, metadata)
-            
-            # Calculate current option value (what it would cost to buy back)
-            current_option_value = current_option_price * 100 * contract_count
-            
-            # Calculate unrealized P&L
-            # For short options: P&L = Premium Collected - Current Option Value
-            # Positive = profit (option lost value), Negative = loss (option gained value)
-            unrealized_pnl = premium_collected - current_option_value
-            
-            # Total P&L (for now, same as unrealized since we don't track realized events yet)
-            total_pnl = unrealized_pnl
-            
-            logger.info(f"Calculated P&L for {cycle.ticker}: Premium=${premium_collected:.2f}, "
-                       f"Current Value=${current_option_value:.2f}, P&L=${total_pnl:.2f}")
-            
-            return {
-                'success': True,
-                'premium_collected': premium_collected,
-                'current_option_value': current_option_value,
-                'unrealized_pnl': unrealized_pnl,
-                'total_pnl': total_pnl,
-                'current_option_price': current_option_price,
-                'calculation_timestamp': self.update_timestamp.isoformat()
-            }
-            
+            return self._pnl_from_price(cycle, metadata, prices.get(quote_request))
         except Exception as e:
-            logger.error(f"Error calculating P&L for wheel cycle {cycle.id}: {e}")
+            logger.error("Error calculating P&L for wheel cycle %s: %s", cycle.id, e)
             return self._get_fallback_pnl(cycle, metadata)
     
-    def _get_fallback_pnl(self, cycle: WheelCycle, metadata: Dict) -> Dict[str, Any]:
+    def _pnl_from_price(self, cycle: WheelCycle, metadata: Dict, current_option_price: Optional[float]) -> PnLResult:
         """
-        Return fallback P&L calculation using only premium collected.
+        Compute P&L for a cycle from an already-fetched option price.
         """
-        premium_per_share = metadata.get('premium', 0)
         contract_count = metadata.get('contract_count', 1)
-        premium_collected = premium_per_share * 100 * contract_count
+        premium_per_share = metadata.get('premium', 0)
+        shares = CONTRACT_MULTIPLIER * contract_count
         
-        return {
-            'success': False,
-            'premium_collected': premium_collected,
-            'current_option_value': 0,
-            'unrealized_pnl': premium_collected,  # Assume all premium is profit
-            'total_pnl': premium_collected,
-            'current_option_price': None,
-            'calculation_timestamp': self.update_timestamp.isoformat(),
-            'error': 'Could not fetch real-time option price'
-        }
+        # Calculate premium collected (what we received when selling the option)
+        premium_collected = premium_per_share * shares
+        
+        if current_option_price is None:
+            logger.warning("Could not fetch current option price for %s", cycle.ticker)
+            return self._get_fallback_pnl(cycle, metadata, premium_collected)
+        
+        # Calculate current option value (what it would cost to buy back)
+        current_option_value = current_option_price * shares
+        
+        # Calculate unrealized P&L
+        # For short options: P&L = Premium Collected - Current Option Value
+        # Positive = profit (option lost value), Negative = loss (option gained value)
+        unrealized_pnl = premium_collected - current_option_value
+        
+        # Total P&L (for now, same as unrealized since we don't track realized events yet)
+        total_pnl = unrealized_pnl
+        
+        logger.info("Calculated P&L for %s: Premium=$%.2f, Current Value=$%.2f, P&L=$%.2f",
+                    cycle.ticker, premium_collected, current_option_value, total_pnl)
+        
+        return PnLResult(
+            success=True,
+            premium_collected=premium_collected,
+            current_option_value=current_option_value,
+            unrealized_pnl=unrealized_pnl,
+            total_pnl=total_pnl,
+            current_option_price=current_option_price,
+            calculation_timestamp=self.update_timestamp_iso
+        )
+    
+    def _get_fallback_pnl(self, cycle: WheelCycle, metadata: Dict,
+                          premium_collected: Optional[float] = None) -> PnLResult:
+        """
+        Return fallback P&L calculation using only premium collected.
+        Callers that already computed premium_collected pass it in.
+        """
+        if premium_collected is None:
+            premium_per_share = metadata.get('premium', 0)
+            contract_count = metadata.get('contract_count', 1)
+            premium_collected = premium_per_share * CONTRACT_MULTIPLIER * contract_count
+        
+        return PnLResult(
+            success=False,
+            premium_collected=premium_collected,
+            current_option_value=0,
+            unrealized_pnl=premium_collected,  # Assume all premium is profit
+            total_pnl=premium_collected,
+            current_option_price=None,
+            calculation_timestamp=self.update_timestamp_iso,
+            error='Could not fetch real-time option price'
+        )
     
     def update_wheel_cycle_pnl(self, cycle: WheelCycle) -> bool:
         """
@@ -131,20 +286,24 @@ class WheelPnLCalculator:
             bool indicating success
         """
         try:
-            pnl_result = self.calculate_wheel_pnl(cycle)
-            
-            # Update cycle with calculated values
-            cycle.current_option_value = pnl_result.get('current_option_value')
-            cycle.unrealized_pnl = pnl_result.get('unrealized_pnl')
-            cycle.total_pnl = pnl_result.get('total_pnl')
-            cycle.price_last_updated = self.update_timestamp
-            
-            return pnl_result.get('success', False)
+            return self._apply_pnl(cycle, self._calculate(cycle))
             
         except Exception as e:
-            logger.error(f"Error updating wheel cycle P&L: {e}")
+            logger.error("Error updating wheel cycle P&L: %s", e)
             return False
     
+    def _apply_pnl(self, cycle: WheelCycle, pnl_result: PnLResult) -> bool:
+        """
+        Copy a P&L result onto the cycle; returns whether the result came from a live price.
+        """
+        # Update cycle with calculated values
+        cycle.current_option_value = pnl_result.current_option_value
+        cycle.unrealized_pnl = pnl_result.unrealized_pnl
+        cycle.total_pnl = pnl_result.total_pnl
+        cycle.price_last_updated = self.update_timestamp
+        
+        return pnl_result.success
+    
     def refresh_all_wheel_pnl(self) -> Dict[str, Any]:
         """
         Refresh P&L for all active wheel cycles.
@@ -153,56 +312,135 @@ class WheelPnLCalculator:
             Summary of refresh results
         """
         try:
-            # Get all active wheel cycles
-            active_cycles = self.db.query(WheelCycle).filter(
-                WheelCycle.status == "Open"
-            ).all()
+            tally = _RefreshTally()
+            prices: Dict[QuoteRequest, Optional[float]] = {}
+            # price_service fetches each batch's distinct chains concurrently.
+            # Nothing is dirty until _finish_refresh, so autoflush would only add work.
+            with self.db.no_autoflush:
+                for cycles in self._open_cycle_batches():
+                    prepared = self._prepare_cycles(cycles)
+                    prices.update(_fetch_quotes([req for req in _unique_quote_requests(prepared) if req not in prices]))
+                    self._tally_batch(tally, prepared, prices)
             
-            if not active_cycles:
-                return {
-                    'success': True,
-                    'message': 'No active wheel cycles found',
-                    'summary': {'total_cycles': 0, 'updated': 0, 'failed': 0}
-                }
-            
-            updated_count = 0
-            failed_count = 0
-            failed_cycles = []
-            
-            # Process each cycle
-            for cycle in active_cycles:
-                success = self.update_wheel_cycle_pnl(cycle)
-                if success:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_cycles.append(f"{cycle.ticker} (ID: {cycle.id})")
-            
-            # Commit all updates
-            self.db.commit()
-            
-            logger.info(f"Wheel P&L refresh completed: {updated_count} updated, {failed_count} failed")
-            
-            return {
-                'success': True,
-                'message': f"Updated {updated_count} of {len(active_cycles)} wheel cycles",
-                'summary': {
-                    'total_cycles': len(active_cycles),
-                    'updated': updated_count,
-                    'failed': failed_count,
-                    'failed_cycles': failed_cycles[:5]  # Limit to first 5 for brevity
-                },
-                'refresh_timestamp': self.update_timestamp.isoformat()
-            }
+            return self._finish_refresh(tally)
             
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error during wheel P&L refresh: {e}")
-            return {
-                'success': False,
-                'message': f"Wheel P&L refresh failed: {str(e)}",
-                'summary': {}
-            }
+            return self._refresh_failed_result(e)
+    
+    def _open_cycle_batches(self) -> Iterator[List[WheelCycle]]:
+        """
+        Stream open wheel cycles from the database in lists of REFRESH_BATCH_SIZE,
+        so quotes for the first batch are fetched while later rows are still unread.
+        """
+        # Load only the columns the P&L path reads; results are written back
+        # with bulk_update_mappings, not through these instances
+        query = self.db.query(WheelCycle).options(
+            load_only(WheelCycle.id, WheelCycle.ticker, WheelCycle.strategy_type, WheelCycle.detection_metadata)
+        ).filter(
+            WheelCycle.status == "Open"
+        ).yield_per(REFRESH_BATCH_SIZE)
+        
+        batch = []
+        for cycle in query:
+            batch.append(cycle)
+            if len(batch) == REFRESH_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _prepare_cycles(self, cycles: List[WheelCycle]) -> List[Tuple[WheelCycle, Optional[Dict], Optional[QuoteRequest]]]:
+        """
+        Parse each cycle into (cycle, metadata, quote request).
+        Metadata is None for cycles whose detection_metadata couldn't be parsed.
+        """
+        prepared = []
+        for cycle in cycles:
+            try:
+                metadata, quote_request = self._prepare_cycle(cycle)
+            except Exception as e:
+                logger.error("Error calculating P&L for wheel cycle %s: %s", cycle.id, e)
+                metadata, quote_request = None, None
+            prepared.append((cycle, metadata, quote_request))
+        return prepared
+    
+    def _tally_batch(self, tally: "_RefreshTally", prepared: List[Tuple],
+                     prices: Dict[QuoteRequest, Optional[float]]) -> None:
+        """
+        Compute P&L for a prepared batch and record the pending row updates.
+        """
+        # Compute results serially; the session is only touched from this thread
+        for cycle, metadata, quote_request in prepared:
+            tally.total += 1
+            success = False
+            if metadata is not None:
+                try:
+                    pnl_result = self._pnl_for_quote(cycle, metadata, quote_request, prices)
+                    tally.updates.append({
+                        'id': cycle.id,
+                        'current_option_value': pnl_result.current_option_value,
+                        'unrealized_pnl': pnl_result.unrealized_pnl,
+                        'total_pnl': pnl_result.total_pnl,
+                        'price_last_updated': self.update_timestamp,
+                    })
+                    success = pnl_result.success
+                except Exception as e:
+                    logger.error("Error updating wheel cycle P&L: %s", e)
+            if success:
+                tally.updated += 1
+            else:
+                tally.failed += 1
+                # Only the first few are reported; don't format the rest
+                if len(tally.failed_cycles) < MAX_REPORTED_FAILURES:
+                    tally.failed_cycles.append(f"{cycle.ticker} (ID: {cycle.id})")
+    
+    def _finish_refresh(self, tally: "_RefreshTally") -> Dict[str, Any]:
+        """
+        Write the tallied updates, commit, and build the refresh summary.
+        """
+        if not tally.total:
+            return self._no_active_cycles_result()
+        
+        # Write all updates as one executemany and commit. The loaded cycles are
+        # not reused, so skip expiring them (and any later lazy reloads) on commit.
+        if tally.updates:
+            self.db.bulk_update_mappings(WheelCycle, tally.updates)
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
+        
+        logger.info("Wheel P&L refresh completed: %d updated, %d failed", tally.updated, tally.failed)
+        
+        return {
+            'success': True,
+            'message': f"Updated {tally.updated} of {tally.total} wheel cycles",
+            'summary': {
+                'total_cycles': tally.total,
+                'updated': tally.updated,
+                'failed': tally.failed,
+                'failed_cycles': tally.failed_cycles  # First MAX_REPORTED_FAILURES only
+            },
+            'refresh_timestamp': self.update_timestamp_iso
+        }
+    
+    def _no_active_cycles_result(self) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'message': 'No active wheel cycles found',
+            'summary': {'total_cycles': 0, 'updated': 0, 'failed': 0}
+        }
+    
+    def _refresh_failed_result(self, error: Exception) -> Dict[str, Any]:
+        self.db.rollback()
+        logger.error("Error during wheel P&L refresh: %s", error)
+        return {
+            'success': False,
+            'message': f"Wheel P&L refresh failed: {str(error)}",
+            'summary': {}
+        }
 
 
 def calculate_wheel_pnl_quick(
@@ -246,7 +484,7 @@ def calculate_wheel_pnl_quick(
             }
         
         # Calculate current option value
-        current_option_value = current_option_price * 100 * contract_count
+        current_option_value = current_option_price * CONTRACT_MULTIPLIER * contract_count
         
         # Calculate P&L
         unrealized_pnl = premium_collected - current_option_value
@@ -263,7 +501,7 @@ def calculate_wheel_pnl_quick(
         }
         
     except Exception as e:
-        logger.error(f"Error in quick wheel P&L calculation: {e}")
+        logger.error("Error in quick wheel P&L calculation: %s", e)
         return {
             'success': False,
             'error': str(e),
@@ -1,11 +1,70 @@
 
 
+from sqlalchemy import and_, distinct, func
 from sqlalchemy.orm import Session
 from .. import models, schemas, crud
+from ..crud_optimized import BatchLoaderService
+from ..models_unified import Position
+from ..schemas import EnhancedPosition, PositionForDetection, PotentialAction, RiskAssessment, WheelDetectionResult
+from .schwab_transform_service import transform_wheels
 from typing import List, Optional, Dict, Any
+from datetime import date, datetime, UTC
+from functools import lru_cache
+from operator import attrgetter
 import csv
 import io
 
+# Optional WheelStrategy CSV columns, converted per cell; blank cells become None
+_WHEEL_CSV_TEXT_COLUMNS = (
+    "trade_date",
+    "sell_put_status",
+    "assignment_status",
+    "sell_call_status",
+    "called_away_status",
+)
+_WHEEL_CSV_NUMERIC_COLUMNS = (
+    ("sell_put_strike_price", float),
+    ("sell_put_open_premium", float),
+    ("sell_put_closed_premium", float),
+    ("sell_put_quantity", int),
+    ("assignment_strike_price", float),
+    ("assignment_shares_quantity", int),
+    ("sell_call_strike_price", float),
+    ("sell_call_open_premium", float),
+    ("sell_call_closed_premium", float),
+    ("sell_call_quantity", int),
+    ("called_away_strike_price", float),
+    ("called_away_shares_quantity", int),
+)
+
+# Active positions fetched per round trip when streaming them into detection
+DETECTION_BATCH_SIZE = 1000
+
+_STRATEGY_CONFIDENCE_BONUS = {'full_wheel': 30, 'covered_call': 20, 'cash_secured_put': 15, 'naked_stock': 10}
+
+# EnhancedPosition.type for an upper-cased option_type; anything else is stock
+_POSITION_TYPE_BY_OPTION_TYPE = {'CALL': 'call', 'PUT': 'put'}
+# (type, position) of an EnhancedPosition in one C-level call, e.g. ('put', 'short')
+_position_side = attrgetter('type', 'position')
+
+# Detection results are memoised on every PositionForDetection field, so a changed
+# position is simply a new key and no explicit invalidation is needed
+DETECTION_CACHE_SIZE = 512
+_DETECTION_POSITION_FIELDS = (
+    'id', 'symbol', 'shares', 'is_option', 'underlying_symbol', 'option_type',
+    'strike_price', 'expiration_date', 'contracts', 'market_value', 'source',
+)
+_position_fingerprint = attrgetter(*_DETECTION_POSITION_FIELDS)
+
+
+@lru_cache(maxsize=DETECTION_CACHE_SIZE)
+def _analyze_ticker_positions_cached(ticker, fingerprint, options_json, today):
+    """Memoised analyze_ticker_positions; the shared result must be treated as read-only."""
+    positions = [PositionForDetection(**dict(zip(_DETECTION_POSITION_FIELDS, values))) for values in fingerprint]
+    options = schemas.WheelDetectionOptions.model_validate_json(options_json) if options_json is not None else None
+    return WheelService.analyze_ticker_positions(ticker, positions, options, today)
+
+
 class WheelService:
 
     @staticmethod
@@ -15,9 +74,7 @@ class WheelService:
         Uses transform_wheels to group transactions, then persists WheelCycle and WheelEvent records.
         Returns list of created WheelCycle objects.
         """
-        from .schwab_transform_service import transform_wheels
-        from datetime import datetime
-        cycles_data = transform_wheels(schwab_json)
+        cycles_data = transform_wheels(schwab_json, include_raw=True)  # events read raw_data["strikePrice"]
         created_cycles = []
         for cycle in cycles_data:
             # Create WheelCycle
@@ -67,24 +124,22 @@ class WheelService:
 
     # --- Detection, Analytics, and Utility Functions ---
     @staticmethod
-    def calculate_days_to_expiration(expiration_date: str) -> int:
-        from datetime import datetime, UTC
+    def calculate_days_to_expiration(expiration_date: str, today=None) -> int:
+        """Whole days from ``today`` (UTC date, computed if omitted) until expiration."""
+        if today is None:
+            today = datetime.now(UTC).date()
         try:
-            if "T" in expiration_date:
-                exp_date = datetime.fromisoformat(expiration_date.replace("Z", "+00:00"))
+            if len(expiration_date) == 10:
+                exp_date = date.fromisoformat(expiration_date)
             else:
-                exp_date = datetime.fromisoformat(expiration_date)
-            today = datetime.now(UTC)
-            diff_time = exp_date - today
-            return max(0, diff_time.days)
+                exp_date = datetime.fromisoformat(expiration_date.replace("Z", "+00:00")).date()
+            return max(0, (exp_date - today).days)
         except Exception:
             return 0
 
     @staticmethod
     def calculate_confidence_score(strategy, positions, cash_required=0, cash_balance=0, market_context=None):
-        score = 50
-        strategy_scores = {'full_wheel': 30, 'covered_call': 20, 'cash_secured_put': 15, 'naked_stock': 10}
-        score += strategy_scores.get(strategy, 0)
+        score = 50 + _STRATEGY_CONFIDENCE_BONUS.get(strategy, 0)
         if cash_required > 0:
             if cash_balance >= cash_required:
                 score += 15
@@ -92,9 +147,15 @@ class WheelService:
                 score += 5
             else:
                 score -= 10
-        option_positions = [p for p in positions if getattr(p, 'days_to_expiration', None) is not None]
-        if option_positions:
-            avg_days_to_exp = sum(p.days_to_expiration for p in option_positions) / len(option_positions)
+        total_days_to_exp = 0
+        option_count = 0
+        for p in positions:
+            days_to_exp = p.days_to_expiration
+            if days_to_exp is not None:
+                total_days_to_exp += days_to_exp
+                option_count += 1
+        if option_count:
+            avg_days_to_exp = total_days_to_exp / option_count
             if avg_days_to_exp > 30:
                 score += 10
             elif avg_days_to_exp < 7:
@@ -117,8 +178,8 @@ class WheelService:
     def calculate_cash_required(short_puts):
         total = 0.0
         for put in short_puts:
-            if getattr(put, 'type', None) == 'put' and getattr(put, 'position', None) == 'short' and getattr(put, 'strike_price', None):
-                contracts = abs(getattr(put, 'raw_quantity', 0) or 0) / 100 if getattr(put, 'raw_quantity', None) else getattr(put, 'quantity', 0) / 100
+            if put.type == 'put' and put.position == 'short' and put.strike_price:
+                contracts = abs(put.raw_quantity) / 100 if put.raw_quantity else put.quantity / 100
                 total += contracts * put.strike_price * 100
         return total
 
@@ -127,7 +188,7 @@ class WheelService:
         factors = []
         level = "medium"
         assignment_risk = 50.0
-        short_options = [p for p in positions if getattr(p, 'position', None) == 'short' and getattr(p, 'days_to_expiration', None) is not None]
+        short_options = [p for p in positions if p.position == 'short' and p.days_to_expiration is not None]
         if short_options:
             min_days_to_exp = min(p.days_to_expiration for p in short_options)
             if min_days_to_exp < 7:
@@ -154,80 +215,78 @@ class WheelService:
             factors.append('Multiple assignment possibilities - complex management')
             if level != 'high':
                 level = 'medium'
-        from ..schemas import RiskAssessment
         return RiskAssessment(level=level, factors=factors, assignment_risk=assignment_risk)
 
     @staticmethod
     def group_positions_by_ticker(positions):
         grouped = {}
         for position in positions:
-            ticker = getattr(position, 'underlying_symbol', None) if getattr(position, 'is_option', False) else getattr(position, 'symbol', None)
-            if ticker not in grouped:
-                grouped[ticker] = []
-            grouped[ticker].append(position)
+            ticker = position.underlying_symbol if position.is_option else position.symbol
+            grouped.setdefault(ticker, []).append(position)
         return grouped
 
     @staticmethod
-    def analyze_ticker_positions(ticker, positions, options=None):
-        from ..schemas import EnhancedPosition, WheelDetectionResult, PotentialAction
-        from .wheel_service import WheelService
-        stock_positions = [p for p in positions if not getattr(p, 'is_option', False)]
-        option_positions = [p for p in positions if getattr(p, 'is_option', False)]
-        call_options = [p for p in option_positions if getattr(p, 'option_type', None) and p.option_type.upper() == 'CALL']
-        put_options = [p for p in option_positions if getattr(p, 'option_type', None) and p.option_type.upper() == 'PUT']
-        total_stock_shares = sum(getattr(p, 'shares', 0) for p in stock_positions)
-        short_calls = [p for p in call_options if (getattr(p, 'contracts', 0) or 0) < 0]
-        short_puts = [p for p in put_options if (getattr(p, 'contracts', 0) or 0) < 0]
+    def analyze_ticker_positions(ticker, positions, options=None, today=None):
+        if today is None:
+            today = datetime.now(UTC).date()
+        # Bucket and format every position in a single pass
+        days_until = WheelService.calculate_days_to_expiration
+        option_positions = []
+        short_calls = []
+        short_puts = []
+        total_stock_shares = 0
         formatted_positions = []
         for p in positions:
-            is_short_position = getattr(p, 'is_option', False) and (getattr(p, 'contracts', 0) or 0) < 0 or not getattr(p, 'is_option', False) and getattr(p, 'shares', 0) < 0
-            raw_quantity = p.contracts if getattr(p, 'is_option', False) else getattr(p, 'shares', 0)
-            days_to_expiration = WheelService.calculate_days_to_expiration(p.expiration_date) if getattr(p, 'expiration_date', None) else None
-            enhanced_pos = EnhancedPosition(
-                type='call' if getattr(p, 'is_option', False) and p.option_type == 'Call' else 'put' if getattr(p, 'is_option', False) and p.option_type == 'Put' else 'stock',
+            is_option = p.is_option
+            contracts = p.contracts
+            expiration_date = p.expiration_date
+            if is_option:
+                option_positions.append(p)
+                option_type = p.option_type.upper() if p.option_type else None
+                if (contracts or 0) < 0:
+                    if option_type == 'CALL':
+                        short_calls.append(p)
+                    elif option_type == 'PUT':
+                        short_puts.append(p)
+                raw_quantity = contracts
+                is_short_position = (contracts or 0) < 0
+            else:
+                option_type = None
+                raw_quantity = p.shares
+                total_stock_shares += raw_quantity
+                is_short_position = raw_quantity < 0
+            formatted_positions.append(EnhancedPosition(
+                type=_POSITION_TYPE_BY_OPTION_TYPE.get(option_type, 'stock'),
                 symbol=p.symbol,
                 quantity=abs(raw_quantity),
                 position='short' if is_short_position else 'long',
-                strike_price=getattr(p, 'strike_price', None),
-                expiration_date=getattr(p, 'expiration_date', None),
-                days_to_expiration=days_to_expiration,
-                market_value=getattr(p, 'market_value', None),
+                strike_price=p.strike_price,
+                expiration_date=expiration_date,
+                days_to_expiration=days_until(expiration_date, today) if expiration_date else None,
+                market_value=p.market_value,
                 raw_quantity=raw_quantity,
-                source=getattr(p, 'source', None)
-            )
-            formatted_positions.append(enhanced_pos)
-        if WheelService.is_full_wheel(total_stock_shares, short_calls, short_puts):
-            return WheelService.create_full_wheel_result(ticker, formatted_positions, short_puts, options)
-        elif WheelService.is_covered_call(total_stock_shares, short_calls):
-            return WheelService.create_covered_call_result(ticker, formatted_positions, total_stock_shares, short_calls, options)
-        elif WheelService.is_cash_secured_put(short_puts):
-            return WheelService.create_cash_secured_put_result(ticker, formatted_positions, short_puts, total_stock_shares, options)
-        elif WheelService.is_naked_stock(total_stock_shares, option_positions):
-            if total_stock_shares >= 100:
-                return WheelService.create_naked_stock_result(ticker, formatted_positions, total_stock_shares, options)
+                source=p.source
+            ))
+        # Full wheel: 100+ shares with short calls and puts; covered call: 100+ shares with
+        # short calls; CSP: any short put; naked stock: 100+ shares and no options at all
+        has_round_lot = total_stock_shares >= 100
+        # Read the request options once for whichever result builder runs
+        cash_balance = getattr(options, 'cash_balance', 0) or 0
+        market_data = getattr(options, 'market_data', None)
+        if has_round_lot and short_calls and short_puts:
+            return WheelService.create_full_wheel_result(ticker, formatted_positions, short_puts, options, cash_balance, market_data)
+        elif has_round_lot and short_calls:
+            return WheelService.create_covered_call_result(ticker, formatted_positions, total_stock_shares, short_calls, options, cash_balance, market_data)
+        elif short_puts:
+            return WheelService.create_cash_secured_put_result(ticker, formatted_positions, short_puts, total_stock_shares, options, cash_balance, market_data)
+        elif has_round_lot and not option_positions:
+            return WheelService.create_naked_stock_result(ticker, formatted_positions, total_stock_shares, options, cash_balance, market_data)
         return None
 
     @staticmethod
-    def is_full_wheel(stock_shares, short_calls, short_puts):
-        return stock_shares >= 100 and len(short_calls) > 0 and len(short_puts) > 0
-
-    @staticmethod
-    def is_covered_call(stock_shares, short_calls):
-        return stock_shares >= 100 and len(short_calls) > 0
-
-    @staticmethod
-    def is_cash_secured_put(short_puts):
-        return len(short_puts) > 0
-
-    @staticmethod
-    def is_naked_stock(stock_shares, option_positions):
-        return stock_shares > 0 and len(option_positions) == 0
-
-    @staticmethod
-    def create_full_wheel_result(ticker, positions, short_puts, options):
-        from ..schemas import PotentialAction, WheelDetectionResult
-        cash_required = WheelService.calculate_cash_required([p for p in positions if p.type == 'put' and p.position == 'short'])
-        confidence, score = WheelService.calculate_confidence_score('full_wheel', positions, cash_required, getattr(options, 'cash_balance', 0) if options else 0, getattr(options, 'market_data', None) if options else None)
+    def create_full_wheel_result(ticker, positions, short_puts, options, cash_balance=0, market_data=None):
+        cash_required = WheelService.calculate_cash_required([p for p in positions if _position_side(p) == ('put', 'short')])
+        confidence, score = WheelService.calculate_confidence_score('full_wheel', positions, cash_required, cash_balance, market_data)
         risk_assessment = WheelService.assess_risk('full_wheel', positions, options)
         return WheelDetectionResult(
             ticker=ticker,
@@ -236,7 +295,7 @@ class WheelService:
             confidence_score=score,
             description=f'Complete wheel strategy: {sum(p.quantity for p in positions if p.type == "stock")} shares with covered call and put-selling capability',
             cash_required=cash_required,
-            cash_validated=getattr(options, 'cash_balance', 0) >= cash_required if options and getattr(options, 'cash_balance', None) else None,
+            cash_validated=cash_balance >= cash_required if cash_balance else None,
             risk_assessment=risk_assessment,
             positions=positions,
             recommendations=[
@@ -249,15 +308,14 @@ class WheelService:
                 PotentialAction(action='close_call', description='Buy back call option for profit', priority='medium'),
                 PotentialAction(action='sell_put', description='Sell additional cash-secured puts', priority='low')
             ],
-            market_context=getattr(options, 'market_data', None) if options else None
+            market_context=market_data
         )
 
     @staticmethod
-    def create_covered_call_result(ticker, positions, total_stock_shares, short_calls, options):
-        from ..schemas import PotentialAction, WheelDetectionResult
-        confidence, score = WheelService.calculate_confidence_score('covered_call', positions, 0, getattr(options, 'cash_balance', 0) if options else 0)
+    def create_covered_call_result(ticker, positions, total_stock_shares, short_calls, options, cash_balance=0, market_data=None):
+        confidence, score = WheelService.calculate_confidence_score('covered_call', positions, 0, cash_balance)
         risk_assessment = WheelService.assess_risk('covered_call', positions, options)
-        short_call_count = len([p for p in positions if p.type == 'call' and p.position == 'short'])
+        short_call_count = sum(1 for p in positions if _position_side(p) == ('call', 'short'))
         return WheelDetectionResult(
             ticker=ticker,
             strategy='covered_call',
@@ -275,16 +333,16 @@ class WheelService:
                 PotentialAction(action='roll_call', description='Extend call expiration', priority='high'),
                 PotentialAction(action='sell_put', description='Start wheel by selling puts below current price', priority='medium')
             ],
-            market_context=getattr(options, 'market_data', None) if options else None
+            market_context=market_data
         )
 
     @staticmethod
-    def create_cash_secured_put_result(ticker, positions, short_puts, total_stock_shares, options):
-        from ..schemas import PotentialAction, WheelDetectionResult
-        cash_required = WheelService.calculate_cash_required([p for p in positions if p.type == 'put' and p.position == 'short'])
-        confidence, score = WheelService.calculate_confidence_score('cash_secured_put', positions, cash_required, getattr(options, 'cash_balance', 0) if options else 0)
+    def create_cash_secured_put_result(ticker, positions, short_puts, total_stock_shares, options, cash_balance=0, market_data=None):
+        formatted_short_puts = [p for p in positions if _position_side(p) == ('put', 'short')]
+        cash_required = WheelService.calculate_cash_required(formatted_short_puts)
+        confidence, score = WheelService.calculate_confidence_score('cash_secured_put', positions, cash_required, cash_balance)
         risk_assessment = WheelService.assess_risk('cash_secured_put', positions, options)
-        short_put_count = len([p for p in positions if p.type == 'put' and p.position == 'short'])
+        short_put_count = len(formatted_short_puts)
         return WheelDetectionResult(
             ticker=ticker,
             strategy='cash_secured_put',
@@ -292,7 +350,7 @@ class WheelService:
             confidence_score=score,
             description=f'Cash-secured put position: {short_put_count} short put(s) {f"with {total_stock_shares} existing shares" if total_stock_shares > 0 else ""}',
             cash_required=cash_required,
-            cash_validated=getattr(options, 'cash_balance', 0) >= cash_required if options and getattr(options, 'cash_balance', None) else None,
+            cash_validated=cash_balance >= cash_required if cash_balance else None,
             risk_assessment=risk_assessment,
             positions=positions,
             recommendations=[
@@ -304,13 +362,12 @@ class WheelService:
                 PotentialAction(action='manage_assignment', description='Prepare for potential share assignment', priority='high'),
                 PotentialAction(action='roll_put', description='Roll put to avoid assignment', priority='medium')
             ],
-            market_context=getattr(options, 'market_data', None) if options else None
+            market_context=market_data
         )
 
     @staticmethod
-    def create_naked_stock_result(ticker, positions, total_stock_shares, options):
-        from ..schemas import PotentialAction, WheelDetectionResult
-        confidence, score = WheelService.calculate_confidence_score('naked_stock', positions, 0, getattr(options, 'cash_balance', 0) if options else 0)
+    def create_naked_stock_result(ticker, positions, total_stock_shares, options, cash_balance=0, market_data=None):
+        confidence, score = WheelService.calculate_confidence_score('naked_stock', positions, 0, cash_balance)
         risk_assessment = WheelService.assess_risk('naked_stock', positions, options)
         return WheelDetectionResult(
             ticker=ticker,
@@ -329,46 +386,61 @@ class WheelService:
                 PotentialAction(action='sell_call', description='Start covered call strategy', priority='high'),
                 PotentialAction(action='start_wheel', description='Begin full wheel strategy', priority='medium')
             ],
-            market_context=getattr(options, 'market_data', None) if options else None
+            market_context=market_data
         )
 
     @staticmethod
     def detect_wheel_strategies(request, db):
-        from ..models_unified import Position
-        from ..schemas import PositionForDetection
-        query = db.query(Position).filter(Position.is_active == True)
+        # Plain row tuples: detection only reads these columns, so skip ORM hydration
+        query = db.query(
+            Position.id,
+            Position.symbol,
+            Position.long_quantity,
+            Position.short_quantity,
+            Position.asset_type,
+            Position.underlying_symbol,
+            Position.option_type,
+            Position.strike_price,
+            Position.expiration_date,
+            Position.market_value,
+            Position.data_source,
+        ).filter(Position.is_active == True)
         if getattr(request, 'account_id', None):
             query = query.filter(Position.account_id == request.account_id)
-        positions = query.all()
-        detection_positions = []
-        for pos in positions:
-            ticker = pos.underlying_symbol or pos.symbol
-            if getattr(request, 'specific_tickers', None) and ticker.upper() not in [t.upper() for t in request.specific_tickers]:
-                continue
-            contracts = None
-            if pos.asset_type == "OPTION":
-                contracts = pos.long_quantity - pos.short_quantity
+        tickers_filter = frozenset(t.upper() for t in getattr(request, 'specific_tickers', None) or ())
+        if tickers_filter:
+            ticker_column = func.coalesce(func.nullif(Position.underlying_symbol, ''), Position.symbol)
+            query = query.filter(func.upper(ticker_column).in_(sorted(tickers_filter)))
+        # Stream rows in batches and group as they arrive instead of buffering the full result
+        grouped_positions = {}
+        for pos in query.yield_per(DETECTION_BATCH_SIZE):
+            shares = pos.long_quantity - pos.short_quantity
+            is_option = pos.asset_type == "OPTION"
             detection_pos = PositionForDetection(
                 id=str(pos.id),
                 symbol=pos.symbol,
-                shares=pos.long_quantity - pos.short_quantity,
-                is_option=pos.asset_type == "OPTION",
+                shares=shares,
+                is_option=is_option,
                 underlying_symbol=pos.underlying_symbol,
                 option_type=pos.option_type,
                 strike_price=pos.strike_price,
                 expiration_date=pos.expiration_date.isoformat() if pos.expiration_date else None,
-                contracts=contracts,
+                contracts=shares if is_option else None,
                 market_value=pos.market_value or 0.0,
                 source=pos.data_source or "unknown"
             )
-            detection_positions.append(detection_pos)
-        if not detection_positions:
+            ticker = pos.underlying_symbol if is_option else pos.symbol
+            grouped_positions.setdefault(ticker, []).append(detection_pos)
+        if not grouped_positions:
             return []
-        grouped_positions = WheelService.group_positions_by_ticker(detection_positions)
         results = []
         strategy_order = {'full_wheel': 0, 'covered_call': 1, 'cash_secured_put': 2, 'naked_stock': 3}
+        today = datetime.now(UTC).date()
+        options = getattr(request, 'options', None)
+        options_json = options.model_dump_json() if options is not None else None
         for ticker, ticker_positions in grouped_positions.items():
-            detection_result = WheelService.analyze_ticker_positions(ticker, ticker_positions, getattr(request, 'options', None))
+            fingerprint = tuple(map(_position_fingerprint, ticker_positions))
+            detection_result = _analyze_ticker_positions_cached(ticker, fingerprint, options_json, today)
             if detection_result:
                 results.append(detection_result)
         results.sort(key=lambda x: (strategy_order.get(x.strategy, 4), -x.confidence_score))
@@ -376,49 +448,12 @@ class WheelService:
     # --- Optimized Endpoints ---
     @staticmethod
     def get_ticker_wheel_data_optimized(db: Session, ticker: str) -> dict:
-        from ..crud_optimized import BatchLoaderService
         data = BatchLoaderService.get_wheel_data_for_ticker(db, ticker)
-        from .. import schemas
+        # from_attributes schemas read the ORM rows directly via model_validate
         return {
-            "cycles": [
-                schemas.WheelCycleRead(
-                    id=c.id,
-                    ticker=c.ticker,
-                    status=c.status,
-                    start_date=c.start_date,
-                    end_date=c.end_date,
-                    notes=c.notes,
-                    detection_metadata=c.detection_metadata,
-                ) for c in data["cycles"]
-            ],
-            "events": [
-                schemas.WheelEventRead(
-                    id=e.id,
-                    cycle_id=e.cycle_id,
-                    event_type=e.event_type,
-                    trade_date=e.trade_date,
-                    quantity_shares=e.quantity_shares,
-                    contracts=e.contracts,
-                    price=e.price,
-                    strike=e.strike,
-                    premium=e.premium,
-                    fees=e.fees,
-                    link_event_id=e.link_event_id,
-                    notes=e.notes,
-                ) for e in data["events"]
-            ],
-            "lots": [
-                schemas.LotRead(
-                    id=l.id,
-                    cycle_id=l.cycle_id,
-                    ticker=l.ticker,
-                    status=l.status,
-                    covered=l.covered,
-                    cost_basis=l.cost_basis,
-                    acquisition_date=l.acquisition_date,
-                    notes=l.notes,
-                ) for l in data["lots"]
-            ],
+            "cycles": [schemas.WheelCycleRead.model_validate(c) for c in data["cycles"]],
+            "events": [schemas.WheelEventRead.model_validate(e) for e in data["events"]],
+            "lots": [schemas.LotRead.model_validate(l) for l in data["lots"]],
             "events_by_lot": data["events_by_lot"],
             "metrics": data["metrics"],
         }
@@ -429,20 +464,18 @@ class WheelService:
 
     @staticmethod
     def wheels_summary(db: Session):
-        open_cycles = db.query(models.WheelCycle).filter(models.WheelCycle.status == "Open").all()
-        cycle_ids = [c.id for c in open_cycles]
-        total_collateral = 0.0
-        if cycle_ids:
-            open_puts = (
-                db.query(models.WheelEvent)
-                .filter(models.WheelEvent.cycle_id.in_(cycle_ids))
-                .filter(models.WheelEvent.event_type == "SELL_PUT_OPEN")
-                .all()
+        # One round trip: count open cycles and sum SELL_PUT_OPEN collateral in SQL
+        open_cycles, total_collateral = db.query(
+            func.count(distinct(models.WheelCycle.id)),
+            func.coalesce(func.sum(models.WheelEvent.contracts * models.WheelEvent.strike * 100.0), 0.0)
+        ).select_from(models.WheelCycle).outerjoin(
+            models.WheelEvent,
+            and_(
+                models.WheelEvent.cycle_id == models.WheelCycle.id,
+                models.WheelEvent.event_type == "SELL_PUT_OPEN"
             )
-            for e in open_puts:
-                if e.contracts and e.strike:
-                    total_collateral += float(e.contracts) * float(e.strike) * 100.0
-        return {"open_cycles": len(open_cycles), "total_collateral": total_collateral}
+        ).filter(models.WheelCycle.status == "Open").one()
+        return {"open_cycles": open_cycles, "total_collateral": float(total_collateral)}
     # --- Lot Endpoints ---
     @staticmethod
     def list_cycle_lots(db: Session, cycle_id: int, status: str | None = None, covered: bool | None = None, ticker: str | None = None):
@@ -477,9 +510,11 @@ class WheelService:
         evt = crud.get_wheel_event(db, option_event_id)
         if not evt or evt.event_type != "SELL_CALL_OPEN":
             return None, "Invalid option event to bind"
-        crud.create_lot_link(db, schemas.LotLinkCreate(lot_id=lot_id, linked_object_type="WHEEL_EVENT", linked_object_id=evt.id, role="CALL_OPEN"))
+        # Link and status ride along with the commit inside refresh_lot_metrics; the
+        # session has autoflush off, so flush first or the metrics won't see the new link
+        db.add(models.LotLink(lot_id=lot_id, linked_object_type="WHEEL_EVENT", linked_object_id=evt.id, role="CALL_OPEN"))
         lot.status = "OPEN_COVERED"
-        db.commit()
+        db.flush()
         crud.refresh_lot_metrics(db, lot_id)
         return {"detail": "Bound"}, None
 
@@ -488,12 +523,11 @@ class WheelService:
         lot = crud.get_lot(db, lot_id)
         if not lot:
             return None
-        links = crud.list_lot_links(db, lot_id)
-        for l in links:
-            if l.role in ("CALL_OPEN", "CALL_CLOSE"):
-                crud.delete_lot_link(db, l.id)
+        db.query(models.LotLink).filter(
+            models.LotLink.lot_id == lot_id,
+            models.LotLink.role.in_(("CALL_OPEN", "CALL_CLOSE"))
+        ).delete()
         lot.status = "OPEN_UNCOVERED"
-        db.commit()
         crud.refresh_lot_metrics(db, lot_id)
         return {"detail": "Unbound"}
 
@@ -505,43 +539,36 @@ class WheelService:
         evt = crud.get_wheel_event(db, option_event_id)
         if not evt or evt.event_type != "SELL_CALL_CLOSE":
             return None, "Invalid close event to bind"
-        crud.create_lot_link(db, schemas.LotLinkCreate(lot_id=lot_id, linked_object_type="WHEEL_EVENT", linked_object_id=evt.id, role="CALL_CLOSE"))
+        db.add(models.LotLink(lot_id=lot_id, linked_object_type="WHEEL_EVENT", linked_object_id=evt.id, role="CALL_CLOSE"))
         if lot.status == "OPEN_COVERED":
             lot.status = "OPEN_UNCOVERED"
-            db.commit()
+        db.flush()
         crud.refresh_lot_metrics(db, lot_id)
         return {"detail": "Bound close"}, None
 
     @staticmethod
     def get_lot_links(db: Session, lot_id: int):
-        links = crud.list_lot_links(db, lot_id)
-        event_ids = [l.linked_object_id for l in links if l.linked_object_type == "WHEEL_EVENT"]
-        events = []
-        if event_ids:
-            events = (
-                db.query(models.WheelEvent)
-                .filter(models.WheelEvent.id.in_(event_ids))
-                .order_by(models.WheelEvent.trade_date.asc(), models.WheelEvent.id.asc())
-                .all()
+        # Links and their wheel events in one round trip
+        rows = (
+            db.query(models.LotLink, models.WheelEvent)
+            .outerjoin(
+                models.WheelEvent,
+                and_(
+                    models.LotLink.linked_object_type == "WHEEL_EVENT",
+                    models.WheelEvent.id == models.LotLink.linked_object_id
+                )
             )
+            .filter(models.LotLink.lot_id == lot_id)
+            .order_by(models.LotLink.id.asc())
+            .all()
+        )
+        links = [l for l, _ in rows]
+        events_by_id = {e.id: e for _, e in rows if e is not None}
+        # Chronological by event_date then id (NULL dates first, as SQLite sorts them)
+        events = sorted(events_by_id.values(), key=lambda e: (e.event_date is not None, e.event_date, e.id))
         return {
-            "links": [schemas.LotLinkRead(id=l.id, lot_id=l.lot_id, linked_object_type=l.linked_object_type, linked_object_id=l.linked_object_id, role=l.role) for l in links],
-            "events": [
-                schemas.WheelEventRead(
-                    id=e.id,
-                    cycle_id=e.cycle_id,
-                    event_type=e.event_type,
-                    trade_date=e.trade_date,
-                    quantity_shares=e.quantity_shares,
-                    contracts=e.contracts,
-                    price=e.price,
-                    strike=e.strike,
-                    premium=e.premium,
-                    fees=e.fees,
-                    link_event_id=e.link_event_id,
-                    notes=e.notes,
-                ) for e in events
-            ]
+            "links": [schemas.LotLinkRead.model_validate(l) for l in links],
+            "events": [schemas.WheelEventRead.model_validate(e) for e in events],
         }
     # --- Event-based Wheel Cycles ---
     @staticmethod
@@ -594,40 +621,30 @@ class WheelService:
 
     @staticmethod
     def parse_wheels_csv(contents: bytes) -> List[models.WheelStrategy]:
-        decoded = contents.decode("utf-8").splitlines()
-        reader = csv.DictReader(decoded)
+        # Decode lazily while reading rather than materialising the whole file as a list of lines
+        reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(contents), encoding="utf-8", newline=""))
         wheels = []
         for row in reader:
             try:
-                db_wheel = models.WheelStrategy(
-                    wheel_id=row.get("wheel_id") or f"{row['ticker'].strip().upper()}-W",
-                    ticker=row["ticker"].strip().upper(),
-                    trade_date=row.get("trade_date"),
-                    sell_put_strike_price=float(row["sell_put_strike_price"]) if row.get("sell_put_strike_price") else None,
-                    sell_put_open_premium=float(row["sell_put_open_premium"]) if row.get("sell_put_open_premium") else None,
-                    sell_put_closed_premium=float(row["sell_put_closed_premium"]) if row.get("sell_put_closed_premium") else None,
-                    sell_put_status=row.get("sell_put_status"),
-                    sell_put_quantity=int(row["sell_put_quantity"]) if row.get("sell_put_quantity") else None,
-                    assignment_strike_price=float(row["assignment_strike_price"]) if row.get("assignment_strike_price") else None,
-                    assignment_shares_quantity=int(row["assignment_shares_quantity"]) if row.get("assignment_shares_quantity") else None,
-                    assignment_status=row.get("assignment_status"),
-                    sell_call_strike_price=float(row["sell_call_strike_price"]) if row.get("sell_call_strike_price") else None,
-                    sell_call_open_premium=float(row["sell_call_open_premium"]) if row.get("sell_call_open_premium") else None,
-                    sell_call_closed_premium=float(row["sell_call_closed_premium"]) if row.get("sell_call_closed_premium") else None,
-                    sell_call_status=row.get("sell_call_status"),
-                    sell_call_quantity=int(row["sell_call_quantity"]) if row.get("sell_call_quantity") else None,
-                    called_away_strike_price=float(row["called_away_strike_price"]) if row.get("called_away_strike_price") else None,
-                    called_away_shares_quantity=int(row["called_away_shares_quantity"]) if row.get("called_away_shares_quantity") else None,
-                    called_away_status=row.get("called_away_status"),
-                )
-                wheels.append(db_wheel)
+                ticker = row["ticker"].strip().upper()
+                fields = {
+                    "wheel_id": row.get("wheel_id") or f"{ticker}-W",
+                    "ticker": ticker,
+                }
+                for column in _WHEEL_CSV_TEXT_COLUMNS:
+                    fields[column] = row.get(column)
+                for column, convert in _WHEEL_CSV_NUMERIC_COLUMNS:
+                    value = row.get(column)
+                    fields[column] = convert(value) if value else None
+                wheels.append(models.WheelStrategy(**fields))
             except Exception:
                 continue
         return wheels
 
     @staticmethod
     def bulk_add_wheels(db: Session, wheels: List[models.WheelStrategy]) -> int:
-        for wheel in wheels:
-            db.add(wheel)
+        # Single executemany INSERT; skips per-object unit-of-work bookkeeping and
+        # leaves the passed objects detached (their ids are not populated)
+        db.bulk_save_objects(wheels)
         db.commit()
         return len(wheels)
@@ -10,31 +10,30 @@ from .database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Set once the admin row is known to exist; later calls in this process skip the DB
+_admin_exists = False
+
 
 def ensure_default_admin() -> None:
     """Create a default admin user if one does not already exist.
 
     Password is read from the ADMIN_PASSWORD environment variable.
-    If not set in development, a random password is generated and logged once
-    so the developer can copy it.
+    If not set in development, a random password is generated and logged once,
+    when the admin is actually created, so the developer can copy it.
     In production (ENVIRONMENT=production), the app refuses to start without
     ADMIN_PASSWORD explicitly set.
     """
+    global _admin_exists
     environment = os.getenv("ENVIRONMENT", "development")
     password = os.getenv("ADMIN_PASSWORD", "")
 
-    if not password:
-        if environment == "production":
-            raise RuntimeError(
-                "ADMIN_PASSWORD env var must be set in production. "
-                "The server refuses to create a default admin with a known password."
-            )
-        password = secrets.token_urlsafe(16)
-        logger.warning(
-            "ADMIN_PASSWORD not set — generated a random admin password: %s "
-            "(set ADMIN_PASSWORD in your .env to override)",
-            password,
+    if not password and environment == "production":
+        raise RuntimeError(
+            "ADMIN_PASSWORD env var must be set in production. "
+            "The server refuses to create a default admin with a known password."
         )
+    if _admin_exists:
+        return
 
     try:
         from .models import User  # local import to avoid circular imports at module load
@@ -42,8 +41,17 @@ def ensure_default_admin() -> None:
 
         db = SessionLocal()
         try:
-            existing = db.query(User).filter(User.username == "admin").first()
-            if not existing:
+            # Indexed existence probe; no need to load the full User row
+            existing = db.query(User.id).filter(User.username == "admin").first()
+            if existing is None:
+                # Only pay for password generation and hashing when the admin is actually created
+                if not password:
+                    password = secrets.token_urlsafe(16)
+                    logger.warning(
+                        "ADMIN_PASSWORD not set — generated a random admin password: %s "
+                        "(set ADMIN_PASSWORD in your .env to override)",
+                        password,
+                    )
                 user = User(
                     username="admin",
                     email="admin@example.com",
@@ -54,6 +62,7 @@ def ensure_default_admin() -> None:
                 db.add(user)
                 db.commit()
                 logger.info("Default admin user created.")
+            _admin_exists = True
         finally:
             db.close()
     except Exception:
@@ -21,6 +21,7 @@ If TOKEN_ENCRYPTION_KEY is not set:
 import os
 import logging
 import base64
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +29,12 @@ logger = logging.getLogger(__name__)
 # Key setup
 # ---------------------------------------------------------------------------
 _raw_key = os.getenv("TOKEN_ENCRYPTION_KEY", "")
+# Built lazily by _get_fernet() so importing this module does not load cryptography
 _fernet = None
+_fernet_initialised = False
+_fernet_lock = threading.Lock()
 
-if _raw_key:
-    try:
-        from cryptography.fernet import Fernet
-        _fernet = Fernet(_raw_key.encode())
-        logger.info("Token encryption enabled (Fernet).")
-    except Exception as exc:
-        logger.error("TOKEN_ENCRYPTION_KEY is set but invalid: %s", exc)
-        _fernet = None
-else:
+if not _raw_key:
     if os.getenv("ENVIRONMENT", "development") == "production":
         raise RuntimeError(
             "TOKEN_ENCRYPTION_KEY must be set in production to protect OAuth tokens at rest. "
@@ -51,10 +47,43 @@ else:
     )
 
 
+def _get_fernet():
+    """Return the Fernet instance, importing cryptography and validating the key on first use."""
+    global _fernet, _fernet_initialised
+    if _fernet_initialised:
+        return _fernet
+    # Double-checked: a caller racing the first initialisation must wait for it,
+    # not see "initialised" with no instance and store a token in plaintext
+    with _fernet_lock:
+        if not _fernet_initialised:
+            fernet = None
+            if _raw_key:
+                try:
+                    from cryptography.fernet import Fernet
+                    fernet = Fernet(_raw_key.encode())
+                    logger.info("Token encryption enabled (Fernet).")
+                except Exception as exc:
+                    logger.error("TOKEN_ENCRYPTION_KEY is set but invalid: %s", exc)
+            _fernet = fernet
+            # Publish the flag only once _fernet holds its final value
+            _fernet_initialised = True
+    return _fernet
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def warm_crypto() -> bool:
+    """
+    Eagerly initialise token encryption (e.g. at application startup) so an
+    invalid key is reported immediately rather than on the first token use.
+
+    Returns True if encryption is enabled.
+    """
+    return _get_fernet() is not None
+
+
 def encrypt_token(plaintext: str | None) -> str | None:
     """
     Encrypt a plaintext token string.
@@ -62,15 +91,15 @@ def encrypt_token(plaintext: str | None) -> str | None:
     Returns the ciphertext as a UTF-8 string, or ``None`` if *plaintext* is
     ``None`` or empty.  If no encryption key is configured, the plaintext is
     returned unchanged (development fallback with a warning already logged).
+    Callers holding raw bytes should use :func:`encrypt_token_bytes`.
     """
-    if not plaintext:
+    if not plaintext or _get_fernet() is None:
         return plaintext
-    if _fernet is None:
-        return plaintext
-    return _fernet.encrypt(plaintext.encode()).decode()
+    # Fernet tokens are URL-safe base64, so ASCII decoding is exact and cheaper than UTF-8
+    return encrypt_token_bytes(plaintext.encode()).decode("ascii")
 
 
-def decrypt_token(ciphertext: str | None) -> str | None:
+def decrypt_token(ciphertext: str | None, max_age: int | None = None) -> str | None:
     """
     Decrypt a ciphertext token string that was produced by :func:`encrypt_token`.
 
@@ -78,18 +107,73 @@ def decrypt_token(ciphertext: str | None) -> str | None:
     If no encryption key is configured, *ciphertext* is returned unchanged
     (matching the no-encryption development fallback of :func:`encrypt_token`).
 
-    Raises ``ValueError`` on decryption failure (wrong key, corrupted data).
+    If *max_age* (seconds) is given, tokens encrypted longer ago than that are
+    rejected.  Fernet compares its plaintext timestamp header before verifying
+    the HMAC or decrypting, so expired tokens cost no crypto work.
+
+    Raises ``ValueError`` on decryption failure (wrong key, corrupted data,
+    or older than *max_age*).
     """
-    if not ciphertext:
+    if not ciphertext or _get_fernet() is None:
         return ciphertext
-    if _fernet is None:
+    return decrypt_token_bytes(ciphertext, max_age=max_age).decode()
+
+
+def encrypt_token_bytes(plaintext: bytes) -> bytes:
+    """
+    Bytes-in, bytes-out variant of :func:`encrypt_token` for callers that
+    already hold raw bytes, avoiding the str encode/decode on either side.
+
+    Returns *plaintext* unchanged if it is empty or no encryption key is configured.
+    """
+    fernet = _get_fernet()
+    if not plaintext or fernet is None:
+        return plaintext
+    return fernet.encrypt(plaintext)
+
+
+def decrypt_token_bytes(ciphertext: bytes | str, max_age: int | None = None) -> bytes:
+    """
+    Decrypt a Fernet token to raw plaintext bytes; see :func:`decrypt_token`
+    for the *max_age* semantics.
+
+    Returns *ciphertext* unchanged if it is empty or no encryption key is configured.
+    Raises ``ValueError`` on decryption failure.
+    """
+    fernet = _get_fernet()
+    if not ciphertext or fernet is None:
         return ciphertext
     try:
-        return _fernet.decrypt(ciphertext.encode()).decode()
+        # Fernet accepts the base64 token as str or bytes; no need to re-encode it first
+        return fernet.decrypt(ciphertext, ttl=max_age)
     except Exception as exc:
         raise ValueError(f"Token decryption failed: {exc}") from exc
 
 
+def decrypt_tokens(ciphertexts: list[str | None], max_age: int | None = None) -> list[str | None]:
+    """
+    Decrypt many tokens (e.g. in a key-rotation sweep), in input order.
+
+    Same semantics as :func:`decrypt_token` per item, but the Fernet instance is
+    resolved once for the whole batch.  Raises ``ValueError`` on the first
+    token that fails to decrypt.
+    """
+    fernet = _get_fernet()
+    if fernet is None:
+        return list(ciphertexts)
+    decrypt = fernet.decrypt
+    plaintexts = []
+    for ciphertext in ciphertexts:
+        if not ciphertext:
+            plaintexts.append(ciphertext)
+            continue
+        try:
+            plaintexts.append(decrypt(ciphertext, ttl=max_age).decode())
+        except Exception as exc:
+            raise ValueError(f"Token decryption failed: {exc}") from exc
+    return plaintexts
+
+
 def is_encryption_enabled() -> bool:
     """Return True if a valid encryption key is configured."""
-    return _fernet is not None
+    return _get_fernet() is not None
@@ -9,8 +9,10 @@ This module provides:
 """
 
 import logging
+import re
+import time
 from datetime import datetime, UTC
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -48,6 +50,21 @@ class ErrorCode(Enum):
     PRICE_FETCH_ERROR = "PRICE_FETCH_ERROR"
     LOT_ASSEMBLY_ERROR = "LOT_ASSEMBLY_ERROR"
 
+# User-facing fallback messages, keyed by error code
+_DEFAULT_USER_MESSAGES: Dict[ErrorCode, str] = {
+    ErrorCode.NETWORK_ERROR: "Network connection failed. Please check your internet connection.",
+    ErrorCode.UNAUTHORIZED: "Please log in to continue.",
+    ErrorCode.FORBIDDEN: "You don't have permission to perform this action.",
+    ErrorCode.NOT_FOUND: "The requested resource was not found.",
+    ErrorCode.VALIDATION_ERROR: "Please check your input and try again.",
+    ErrorCode.BUSINESS_RULE_ERROR: "This action violates business rules.",
+    ErrorCode.SERVER_ERROR: "An unexpected error occurred. Please try again.",
+    ErrorCode.DATABASE_ERROR: "Database operation failed. Please try again.",
+    ErrorCode.PRICE_FETCH_ERROR: "Unable to fetch current prices. Please try again.",
+    ErrorCode.WHEEL_STRATEGY_ERROR: "Wheel strategy operation failed.",
+    ErrorCode.LOT_ASSEMBLY_ERROR: "Unable to assemble lots. Please check your events."
+}
+
 class AppError(Exception):
     """
     Custom application error with structured information.
@@ -73,24 +90,18 @@ class AppError(Exception):
         self.context = context or {}
         self.user_message = user_message or self._get_default_user_message(code)
         self.status_code = status_code
-        self.timestamp = datetime.now(UTC).isoformat()
+        # Formatted on demand: most errors are logged or swallowed, not serialised
+        self._ts_epoch = time.time()
+
+    @property
+    def timestamp(self) -> str:
+        """ISO-8601 UTC timestamp of when the error was raised"""
+        return datetime.fromtimestamp(self._ts_epoch, UTC).isoformat()
         
-    def _get_default_user_message(self, code: ErrorCode) -> str:
+    @staticmethod
+    def _get_default_user_message(code: ErrorCode) -> str:
         """Generate user-friendly messages for error codes"""
-        messages = {
-            ErrorCode.NETWORK_ERROR: "Network connection failed. Please check your internet connection.",
-            ErrorCode.UNAUTHORIZED: "Please log in to continue.",
-            ErrorCode.FORBIDDEN: "You don't have permission to perform this action.",
-            ErrorCode.NOT_FOUND: "The requested resource was not found.",
-            ErrorCode.VALIDATION_ERROR: "Please check your input and try again.",
-            ErrorCode.BUSINESS_RULE_ERROR: "This action violates business rules.",
-            ErrorCode.SERVER_ERROR: "An unexpected error occurred. Please try again.",
-            ErrorCode.DATABASE_ERROR: "Database operation failed. Please try again.",
-            ErrorCode.PRICE_FETCH_ERROR: "Unable to fetch current prices. Please try again.",
-            ErrorCode.WHEEL_STRATEGY_ERROR: "Wheel strategy operation failed.",
-            ErrorCode.LOT_ASSEMBLY_ERROR: "Unable to assemble lots. Please check your events."
-        }
-        return messages.get(code, "An unexpected error occurred.")
+        return _DEFAULT_USER_MESSAGES.get(code, "An unexpected error occurred.")
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert error to dictionary for JSON serialization"""
@@ -162,25 +173,42 @@ def log_error(error: AppError, request_id: str = None) -> None:
     In production, this would integrate with error monitoring services
     like Sentry, DataDog, or CloudWatch.
     """
+    # Log at appropriate level based on error type
+    if error.status_code >= 500:
+        level, msg = logging.ERROR, "Server error occurred"
+    elif error.status_code >= 400:
+        level, msg = logging.WARNING, "Client error occurred"
+    else:
+        level, msg = logging.INFO, "Error handled"
+    
+    # Skip building the record entirely when this level is filtered out
+    if not logger.isEnabledFor(level):
+        return
+    
     log_data = {
         "error_code": error.code.value,
-        "message": error.message,
+        "error_message": error.message,
         "context": error.context,
         "timestamp": error.timestamp,
         "request_id": request_id
     }
-    
-    # Log at appropriate level based on error type
-    if error.status_code >= 500:
-        logger.error("Server error occurred", extra=log_data)
-    elif error.status_code >= 400:
-        logger.warning("Client error occurred", extra=log_data)
-    else:
-        logger.info("Error handled", extra=log_data)
+    logger.log(level, msg, extra=log_data)
     
     # In production, send to monitoring service
     # send_to_monitoring_service(log_data)
 
+# Upstream HTTP statuses that map straight onto an AppError
+_HTTP_STATUS_ERRORS: Dict[int, Tuple[str, ErrorCode]] = {
+    401: ("Authentication failed", ErrorCode.UNAUTHORIZED),
+    403: ("Access forbidden", ErrorCode.FORBIDDEN),
+    404: ("Resource not found", ErrorCode.NOT_FOUND),
+    429: ("Rate limit exceeded", ErrorCode.RATE_LIMIT_ERROR),
+}
+
+# Exception type names / messages that identify database and network failures
+_DATABASE_ERROR_RE = re.compile(r"database|sql", re.IGNORECASE)
+_NETWORK_ERROR_RE = re.compile(r"connection|timeout", re.IGNORECASE)
+
 def handle_api_error(error: Exception, context: Dict[str, Any] = None) -> AppError:
     """
     Convert various exception types to structured AppError.
@@ -197,36 +225,16 @@ def handle_api_error(error: Exception, context: Dict[str, Any] = None) -> AppErr
     if hasattr(error, 'status_code'):
         # Handle HTTP errors from requests
         status_code = error.status_code
-        
-        if status_code == 401:
+        mapped = _HTTP_STATUS_ERRORS.get(status_code)
+        if mapped is not None:
+            message, code = mapped
             return AppError(
-                message="Authentication failed",
-                code=ErrorCode.UNAUTHORIZED,
+                message=message,
+                code=code,
                 context=context,
-                status_code=401
-            )
-        elif status_code == 403:
-            return AppError(
-                message="Access forbidden",
-                code=ErrorCode.FORBIDDEN,
-                context=context,
-                status_code=403
-            )
-        elif status_code == 404:
-            return AppError(
-                message="Resource not found",
-                code=ErrorCode.NOT_FOUND,
-                context=context,
-                status_code=404
-            )
-        elif status_code == 429:
-            return AppError(
-                message="Rate limit exceeded",
-                code=ErrorCode.RATE_LIMIT_ERROR,
-                context=context,
-                status_code=429
+                status_code=status_code
             )
-        elif status_code >= 500:
+        if status_code >= 500:
             return AppError(
                 message="External service error",
                 code=ErrorCode.EXTERNAL_SERVICE_ERROR,
@@ -235,7 +243,7 @@ def handle_api_error(error: Exception, context: Dict[str, Any] = None) -> AppErr
             )
     
     # Handle database errors
-    if "database" in str(type(error)).lower() or "sql" in str(type(error)).lower():
+    if _DATABASE_ERROR_RE.search(str(type(error))):
         return AppError(
             message=f"Database error: {str(error)}",
             code=ErrorCode.DATABASE_ERROR,
@@ -244,7 +252,7 @@ def handle_api_error(error: Exception, context: Dict[str, Any] = None) -> AppErr
         )
     
     # Handle network errors
-    if "connection" in str(error).lower() or "timeout" in str(error).lower():
+    if _NETWORK_ERROR_RE.search(str(error)):
         return AppError(
             message=f"Network error: {str(error)}",
             code=ErrorCode.NETWORK_ERROR,
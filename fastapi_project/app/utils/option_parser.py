@@ -8,6 +8,14 @@ Parses standard option symbols like "HIMS  251017P00037000" into readable compon
 - Strike: $37.00
 """
 
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Quote refreshes and position syncs see the same contracts over and over
+OPTION_SYMBOL_CACHE_SIZE = 4096
+
+_OPTION_FIELDS = ("ticker", "expiry_date", "option_type", "strike_price")
+
 def parse_option_symbol(symbol):
     """
     Parse option symbol into components
@@ -17,6 +25,14 @@ def parse_option_symbol(symbol):
     
     Returns dict with ticker, expiry_date, option_type, strike_price
     """
+    fields = _parse_option_fields(symbol)
+    if fields is None:
+        return None
+    return dict(zip(_OPTION_FIELDS, fields))
+
+@lru_cache(maxsize=OPTION_SYMBOL_CACHE_SIZE)
+def _parse_option_fields(symbol: str) -> Optional[Tuple[str, str, str, float]]:
+    """Memoised parse returning an immutable tuple, so cached results cannot be mutated by callers"""
     try:
         # Split ticker from option code
         parts = symbol.strip().split()
@@ -30,18 +46,12 @@ def parse_option_symbol(symbol):
         if len(option_code) < 15:
             return None
         
-        # Extract date components
-        year_code = option_code[0:2]    # "25" → 2025
-        month = option_code[2:4]        # "10" → October  
-        day = option_code[4:6]          # "17" → 17th
+        # Extract components
         option_type_code = option_code[6]  # "P" → Put
         strike_code = option_code[7:15]    # "00037000" → 37000
         
-        # Convert year (handle 2000s properly)
-        year = 2000 + int(year_code)
-        
-        # Format expiry date
-        expiry_date = f"{year}-{month}-{day}"
+        # Format expiry date ("251017" → "2025-10-17"); shared across many contracts
+        expiry_date = _format_expiry(option_code[0:6])
         
         # Convert option type
         option_type = "Put" if option_type_code == "P" else "Call"
@@ -49,16 +59,32 @@ def parse_option_symbol(symbol):
         # Convert strike price (from thousandths to dollars)
         strike_price = int(strike_code) / 1000.0
         
-        return {
-            "ticker": ticker,
-            "expiry_date": expiry_date,
-            "option_type": option_type,
-            "strike_price": strike_price
-        }
+        return ticker, expiry_date, option_type, strike_price
         
     except (ValueError, IndexError) as e:
         # Return None for unparseable symbols
         return None
 
+@lru_cache(maxsize=1024)
+def _format_expiry(yymmdd: str) -> str:
+    """Format a YYMMDD code as an ISO date, raising ValueError for a non-numeric year"""
+    return f"{2000 + int(yymmdd[0:2])}-{yymmdd[2:4]}-{yymmdd[4:6]}"
+
+def parse_option_symbols(symbols: Iterable[str]) -> List[Optional[Dict]]:
+    """
+    Parse many option symbols at once, in input order.
+
+    Positions dumps repeat the same contract across accounts and legs, so each
+    distinct symbol is parsed once and the result shared. Treat the returned
+    dicts as read-only.
+    """
+    parsed: Dict[str, Optional[Dict]] = {}
+    results = []
+    for symbol in symbols:
+        if symbol not in parsed:
+            parsed[symbol] = parse_option_symbol(symbol)
+        results.append(parsed[symbol])
+    return results
+
 def test_parser():
     pass
@@ -1,10 +0,0 @@
-import sqlite3
-
-conn = sqlite3.connect('test.db')
-cursor = conn.cursor()
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-tables = cursor.fetchall()
-print('Tables in database:')
-for table in tables:
-    print(f"  - {table[0]}")
-conn.close()
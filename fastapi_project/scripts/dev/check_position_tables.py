@@ -0,0 +1,39 @@
+import sqlite3
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def count_rows(cursor, tables):
+    """Row counts for every table in one UNION ALL query instead of one round-trip each."""
+    if not tables:
+        return {}
+    sql = " UNION ALL ".join(f"SELECT ?, COUNT(*) FROM {quote_identifier(t)}" for t in tables)
+    return dict(cursor.execute(sql, list(tables)).fetchall())
+
+
+def main():
+    conn = sqlite3.connect('test.db')
+    cursor = conn.cursor()
+
+    # Check row counts for position-related tables
+    tables = ['schwab_positions', 'positions', 'position_snapshots']
+    for table, count in count_rows(cursor, tables).items():
+        print(f"{table}: {count} rows")
+
+    # Get sample data from schwab_positions
+    print("\nSample from schwab_positions:")
+    cursor.execute("SELECT * FROM schwab_positions LIMIT 3")
+    rows = cursor.fetchall()
+    cursor.execute("PRAGMA table_info(schwab_positions)")
+    columns = [col[1] for col in cursor.fetchall()]
+    print(f"Columns: {columns}")
+    for row in rows:
+        print(f"  {dict(zip(columns, row))}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
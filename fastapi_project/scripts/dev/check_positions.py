@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import sqlite3
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def count_rows(cursor, tables):
+    """Row counts for every table in one UNION ALL query instead of one round-trip each."""
+    if not tables:
+        return {}
+    sql = " UNION ALL ".join(f"SELECT ?, COUNT(*) FROM {quote_identifier(t)}" for t in tables)
+    return dict(cursor.execute(sql, list(tables)).fetchall())
+
+
+def main():
+    # Connect to the database
+    conn = sqlite3.connect('test.db')
+    cursor = conn.cursor()
+
+    print("=== Checking positions table ===")
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%position%'")
+    tables = [t[0] for t in cursor.fetchall()]
+    print("Position-related tables:", tables)
+    counts = count_rows(cursor, tables)
+
+    for table_name in tables:
+        print(f"\n=== {table_name} table ===")
+        cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+        columns = cursor.fetchall()
+        print(f"Columns: {[col[1] for col in columns]}")
+
+        count = counts[table_name]
+        print(f"Row count: {count}")
+
+        if count > 0:
+            cursor.execute(f"SELECT * FROM {quote_identifier(table_name)} LIMIT 3")
+            sample_data = cursor.fetchall()
+            print("Sample data:")
+            for i, row in enumerate(sample_data):
+                print(f"  Row {i+1}: {row}")
+
+    print("\n=== Checking other position sources ===")
+    sources = ['stocks', 'options', 'schwab_positions']
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    existing = {t[0] for t in cursor.fetchall()}
+    counts = count_rows(cursor, [t for t in sources if t in existing])
+    for table in sources:
+        if table not in counts:
+            print(f"{table}: Error - no such table: {table}")
+            continue
+        try:
+            count = counts[table]
+            print(f"{table}: {count} rows")
+
+            if count > 0:
+                cursor.execute(f"SELECT * FROM {table} LIMIT 2")
+                sample = cursor.fetchall()
+                print(f"  Sample from {table}: {sample}")
+        except Exception as e:
+            print(f"{table}: Error - {e}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import sqlite3
+
+
+def main():
+    conn = sqlite3.connect('test.db')
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+    tables = cursor.fetchall()
+    print('Tables in database:')
+    for table in tables:
+        print(f"  - {table[0]}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
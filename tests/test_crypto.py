@@ -0,0 +1,63 @@
+"""
+Unit tests for the lazily initialised token encryption helpers
+"""
+
+import threading
+
+import pytest
+from app.utils import crypto
+
+Fernet = pytest.importorskip("cryptography.fernet").Fernet
+
+
+@pytest.fixture
+def set_key(monkeypatch):
+    """Reset the lazy Fernet state and configure TOKEN_ENCRYPTION_KEY for one test."""
+    def _set(raw_key):
+        monkeypatch.setattr(crypto, "_raw_key", raw_key)
+        monkeypatch.setattr(crypto, "_fernet", None)
+        monkeypatch.setattr(crypto, "_fernet_initialised", False)
+    return _set
+
+
+def test_tokens_round_trip_after_lazy_init(set_key):
+    set_key(Fernet.generate_key().decode())
+
+    ciphertext = crypto.encrypt_token("refresh-token")
+
+    assert ciphertext != "refresh-token"
+    assert crypto.decrypt_token(ciphertext) == "refresh-token"
+    assert crypto.decrypt_tokens([ciphertext, None]) == ["refresh-token", None]
+    assert crypto.is_encryption_enabled()
+
+
+def test_warm_crypto_reports_invalid_key(set_key):
+    set_key("not-a-fernet-key")
+
+    assert crypto.warm_crypto() is False
+
+
+def test_concurrent_first_use_never_returns_plaintext(set_key):
+    set_key(Fernet.generate_key().decode())
+    start = threading.Barrier(8)
+    results = []
+
+    def encrypt():
+        start.wait()
+        results.append(crypto.encrypt_token("access-token"))
+
+    threads = [threading.Thread(target=encrypt) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 8
+    assert "access-token" not in results
+
+
+def test_encrypt_token_passthrough_without_key_keeps_str(set_key):
+    set_key("")
+
+    assert crypto.encrypt_token("access-token") == "access-token"
+    assert crypto.encrypt_token_bytes(b"access-token") == b"access-token"
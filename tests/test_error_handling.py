@@ -0,0 +1,25 @@
+"""
+Unit tests for AppError logging helpers
+"""
+
+import logging
+
+from app.utils.error_handling import AppError, ErrorCode, ValidationError, log_error
+
+
+def test_log_error_emits_structured_record(caplog):
+    with caplog.at_level(logging.INFO, logger="app.utils.error_handling"):
+        log_error(AppError("boom", code=ErrorCode.DATABASE_ERROR), request_id="req-1")
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.ERROR
+    assert record.error_code == "DATABASE_ERROR"
+    assert record.error_message == "boom"
+    assert record.request_id == "req-1"
+
+
+def test_log_error_skips_levels_that_are_filtered_out(caplog):
+    with caplog.at_level(logging.ERROR, logger="app.utils.error_handling"):
+        log_error(ValidationError("bad input", field="ticker"))
+
+    assert caplog.records == []
@@ -0,0 +1,22 @@
+"""
+Unit tests for the OCC option symbol parser
+"""
+
+from app.utils.option_parser import parse_option_symbol, parse_option_symbols
+
+
+def test_parse_option_symbol_reads_occ_fields():
+    assert parse_option_symbol("HIMS  251017P00037000") == {
+        "ticker": "HIMS",
+        "expiry_date": "2025-10-17",
+        "option_type": "Put",
+        "strike_price": 37.0,
+    }
+
+
+def test_parse_option_symbols_keeps_order_and_rejects_bad_symbols():
+    symbols = ["AAPL  240315C00180000", "AAPL", "AAPL  240315C00180000", "HIMS  2510"]
+    parsed = parse_option_symbols(symbols)
+
+    assert [p and p["strike_price"] for p in parsed] == [180.0, None, 180.0, None]
+    assert parsed[0] == parse_option_symbol(symbols[0])
@@ -0,0 +1,164 @@
+"""
+Unit tests for the in-memory caching and batch quote paths of price_service
+"""
+
+import threading
+import time
+
+import pytest
+from app.services import price_service
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches(monkeypatch):
+    """Start every test with empty caches and a dummy API key."""
+    monkeypatch.setattr(price_service, "TD_API_KEY", "test-key")
+    price_service._cache_prices_td.clear()
+    price_service._cache_prices_yf.clear()
+    price_service._cache_ticker_info.clear()
+    price_service.clear_option_price_cache()
+    yield
+    price_service._cache_ticker_info.clear()
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    """Caches are capped and evict the oldest untouched entry first."""
+    monkeypatch.setattr(price_service, "CACHE_MAX_ENTRIES", 2)
+    cache = price_service._cache_prices_td
+    price_service._cache_put(cache, "AAPL", 1.0, 0.0)
+    price_service._cache_put(cache, "MSFT", 2.0, 0.0)
+    assert price_service._cache_get(cache, "AAPL", 20.0, 1.0) == 1.0
+    price_service._cache_put(cache, "NVDA", 3.0, 0.0)
+
+    assert list(cache) == ["AAPL", "NVDA"]
+
+
+def test_cache_entry_expires_after_ttl():
+    cache = price_service._cache_prices_td
+    price_service._cache_put(cache, "AAPL", 1.0, 0.0)
+    assert price_service._cache_get(cache, "AAPL", 20.0, 25.0) is None
+
+
+def test_fetch_ticker_infos_uses_single_batch_request(monkeypatch):
+    """Cache misses are resolved with one comma-separated quote request."""
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return _FakeResponse({
+            "AAPL": {"symbol": "AAPL", "name": "Apple Inc", "close": "190.1"},
+            "BAD": {"code": 404, "message": "symbol not found"},
+        })
+
+    monkeypatch.setattr(price_service.requests, "get", fake_get)
+    infos = price_service.fetch_ticker_infos(["AAPL", "BAD", "AAPL"])
+
+    assert len(calls) == 1
+    assert "symbol=AAPL,BAD" in calls[0]
+    assert infos["AAPL"]["name"] == "Apple Inc"
+    assert infos["BAD"] == {}
+
+    # Second call is served from cache for the resolved symbol
+    calls.clear()
+    infos = price_service.fetch_ticker_infos(["AAPL"])
+    assert calls == []
+    assert infos["AAPL"]["last_price"] == "190.1"
+
+
+def test_fetch_latest_price_coalesces_concurrent_misses(monkeypatch):
+    """Threads missing the cache for the same ticker share one HTTP request."""
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        time.sleep(0.05)
+        return _FakeResponse({"price": "101.5"})
+
+    monkeypatch.setattr(price_service.requests, "get", fake_get)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(price_service.fetch_latest_price("AAPL")))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [101.5] * 5
+
+
+def test_fetch_option_contract_price_shares_cached_chain(monkeypatch):
+    """Quotes on one (ticker, expiry) within the TTL download the chain once."""
+    pd = pytest.importorskip("pandas")
+    calls = []
+
+    class _Ticker:
+        def __init__(self, ticker, session=None):
+            pass
+
+        def option_chain(self, expiry):
+            calls.append(expiry)
+            frame = pd.DataFrame({"strike": [150.0, 155.0], "lastPrice": [2.5, 1.0]})
+            return type("Chain", (), {"calls": frame, "puts": frame})()
+
+    monkeypatch.setattr(price_service.yf, "Ticker", _Ticker)
+    assert price_service.fetch_option_contract_price("AAPL", "2030-01-18", "Put", 150) == 2.5
+    assert price_service.fetch_option_contract_price("AAPL", "2030-01-18", "put", 155.0) == 1.0
+    assert len(calls) == 1
+
+
+def test_clear_option_price_cache_forces_chain_refetch(monkeypatch):
+    pd = pytest.importorskip("pandas")
+    calls = []
+
+    class _Ticker:
+        def __init__(self, ticker, session=None):
+            pass
+
+        def option_chain(self, expiry):
+            calls.append(expiry)
+            frame = pd.DataFrame({"strike": [150.0], "lastPrice": [2.5]})
+            return type("Chain", (), {"calls": frame, "puts": frame})()
+
+    monkeypatch.setattr(price_service.yf, "Ticker", _Ticker)
+    price_service.fetch_option_contract_price("AAPL", "2030-01-18", "Put", 150)
+    price_service.clear_option_price_cache()
+    price_service.fetch_option_contract_price("AAPL", "2030-01-18", "Put", 150)
+
+    assert len(calls) == 2
+
+
+def test_fetch_option_contract_prices_downloads_each_chain_once(monkeypatch):
+    pd = pytest.importorskip("pandas")
+    downloads = []
+
+    def fake_chain(ticker, expiry_date):
+        downloads.append((ticker, expiry_date))
+        if ticker == "BAD":
+            return None
+        frame = pd.DataFrame({"strike": [150.0, 155.0], "lastPrice": [2.5, 1.0]})
+        return type("Chain", (), {"calls": frame, "puts": frame})()
+
+    monkeypatch.setattr(price_service, "fetch_option_chain", fake_chain)
+    prices = price_service.fetch_option_contract_prices([
+        ("AAPL", "2030-01-18", "Put", 150.0),
+        ("AAPL", "2030-01-18", "Call", 155.0),
+        ("AAPL", "2030-01-18", "Put", 160.0),
+        ("BAD", "2030-01-18", "Put", 150.0),
+    ])
+
+    assert prices == [2.5, 1.0, None, None]
+    assert sorted(downloads) == [("AAPL", "2030-01-18"), ("BAD", "2030-01-18")]
@@ -0,0 +1,36 @@
+"""
+Unit tests for SchwabSyncService option-description parsing
+"""
+
+from datetime import datetime
+
+from app.services.schwab_sync_service import SchwabSyncService
+
+
+def _parse(description):
+    service = SchwabSyncService(db=None)
+    return service.parse_option_details({
+        "assetType": "OPTION",
+        "underlyingSymbol": "NVDA",
+        "putCall": "CALL",
+        "description": description,
+    })
+
+
+def test_parse_option_details_standard_layout():
+    details = _parse("NVIDIA CORP 09/19/2025 $230 Call")
+    assert details["underlying_symbol"] == "NVDA"
+    assert details["strike_price"] == 230.0
+    assert details["expiration_date"] == datetime(2025, 9, 19)
+
+
+def test_parse_option_details_falls_back_for_other_layouts():
+    """Descriptions that don't match the fast path are still scanned for both fields."""
+    details = _parse("NVIDIA CORP $12.5 Put exp 1/5/2026")
+    assert details["strike_price"] == 12.5
+    assert details["expiration_date"] == datetime(2026, 1, 5)
+
+
+def test_parse_option_details_ignores_non_options():
+    service = SchwabSyncService(db=None)
+    assert service.parse_option_details({"assetType": "EQUITY", "description": "NVIDIA CORP"}) == {}
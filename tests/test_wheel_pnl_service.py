@@ -0,0 +1,183 @@
+"""
+Unit tests for the bulk refresh path of WheelPnLCalculator
+"""
+
+import contextlib
+import json
+from types import SimpleNamespace
+
+import pytest
+from app.services import wheel_pnl_service
+from app.services.wheel_pnl_service import WheelPnLCalculator
+
+
+class _FakeQuery:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def options(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def yield_per(self, count):
+        self.batch_size = count
+        return iter(list(self._rows))
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.commits = 0
+        self.updates = {}
+        self.no_autoflush = contextlib.nullcontext()
+        self.expire_on_commit = True
+
+    def query(self, *args):
+        return _FakeQuery(self.rows)
+
+    def bulk_update_mappings(self, mapper, mappings):
+        for mapping in mappings:
+            self.updates[mapping["id"]] = mapping
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def _cycle(cycle_id, ticker, strike, premium=2.0, strategy="cash_secured_put"):
+    return SimpleNamespace(
+        id=cycle_id,
+        ticker=ticker,
+        strategy_type=strategy,
+        detection_metadata=json.dumps({
+            "strike_price": strike,
+            "expiration_date": "2030-01-18",
+            "contract_count": 1,
+            "premium": premium,
+        }),
+        current_option_value=None,
+        unrealized_pnl=None,
+        total_pnl=None,
+        price_last_updated=None,
+    )
+
+
+@pytest.fixture
+def quotes(monkeypatch):
+    """Fake option quotes keyed by ticker; records each contract and batch requested."""
+    prices = {"AAPL": 0.5, "MSFT": 1.25}
+    state = {"calls": [], "batches": []}
+
+    def fake_fetch(ticker, expiry_date, option_type, strike_price):
+        state["calls"].append((ticker, expiry_date, option_type, strike_price))
+        return prices.get(ticker)
+
+    def fake_fetch_many(contracts):
+        state["batches"].append(list(contracts))
+        return [fake_fetch(*contract) for contract in contracts]
+
+    monkeypatch.setattr(wheel_pnl_service, "fetch_option_contract_price", fake_fetch)
+    monkeypatch.setattr(wheel_pnl_service, "fetch_option_contract_prices", fake_fetch_many)
+    return state
+
+
+def test_refresh_all_wheel_pnl_prices_cycles_in_one_batch(quotes):
+    cycles = [_cycle(1, "AAPL", 150), _cycle(2, "MSFT", 300), _cycle(3, "NVDA", 100)]
+    db = _FakeSession(cycles)
+
+    result = WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert len(quotes["batches"]) == 1
+    assert result["summary"]["updated"] == 2
+    assert result["summary"]["failed"] == 1
+    assert db.commits == 1
+    # Premium collected $200 minus the cost to buy back the contract
+    assert db.updates[1]["unrealized_pnl"] == pytest.approx(200 - 50)
+    assert db.updates[2]["current_option_value"] == pytest.approx(125)
+    # Unpriced cycle falls back to premium collected
+    assert db.updates[3]["total_pnl"] == pytest.approx(200)
+
+
+def test_refresh_all_wheel_pnl_skips_unparseable_metadata(quotes):
+    broken = _cycle(1, "AAPL", 150)
+    broken.detection_metadata = "{not json"
+    db = _FakeSession([broken, _cycle(2, "MSFT", 300)])
+
+    result = WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert result["summary"]["updated"] == 1
+    assert result["summary"]["failed_cycles"] == ["AAPL (ID: 1)"]
+    assert list(db.updates) == [2]
+
+
+def test_refresh_all_wheel_pnl_fetches_each_contract_once(quotes):
+    cycles = [_cycle(1, "AAPL", 150), _cycle(2, "AAPL", 150.0, premium=3.0), _cycle(3, "AAPL", 155)]
+    db = _FakeSession(cycles)
+
+    WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert sorted(call[3] for call in quotes["calls"]) == [150.0, 155.0]
+    assert db.updates[2]["unrealized_pnl"] == pytest.approx(300 - 50)
+
+
+def test_refresh_all_wheel_pnl_streams_cycles_in_batches(quotes, monkeypatch):
+    monkeypatch.setattr(wheel_pnl_service, "REFRESH_BATCH_SIZE", 2)
+    cycles = [_cycle(i, "AAPL", 100 + i) for i in range(1, 6)]
+    db = _FakeSession(cycles)
+
+    result = WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert result["summary"]["total_cycles"] == 5
+    assert sorted(db.updates) == [1, 2, 3, 4, 5]
+    assert db.commits == 1
+
+
+def test_refresh_all_wheel_pnl_without_open_cycles(quotes):
+    db = _FakeSession([])
+
+    result = WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert result["summary"] == {"total_cycles": 0, "updated": 0, "failed": 0}
+    assert db.commits == 0
+
+
+def test_refresh_all_wheel_pnl_prices_zero_premium_cycles(quotes):
+    """A zero premium is a real value, not missing metadata."""
+    db = _FakeSession([_cycle(1, "AAPL", 150, premium=0)])
+
+    result = WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert result["summary"]["updated"] == 1
+    assert db.updates[1]["unrealized_pnl"] == pytest.approx(-50)
+
+
+def test_calculate_wheel_pnl_falls_back_on_unparseable_metadata(quotes):
+    broken = _cycle(1, "AAPL", 150)
+    broken.detection_metadata = "{not json"
+
+    result = WheelPnLCalculator(_FakeSession([])).calculate_wheel_pnl(broken)
+
+    assert result["success"] is False
+    assert result["premium_collected"] == 0
+
+
+def test_refresh_all_wheel_pnl_prices_expired_options_at_intrinsic(quotes, monkeypatch):
+    """Expired contracts are valued from the underlying instead of the option chain."""
+    monkeypatch.setattr(wheel_pnl_service, "fetch_yf_price", lambda ticker: 140.0)
+    expired_put = _cycle(1, "AAPL", 150)
+    expired_call = _cycle(2, "AAPL", 150, strategy="covered_call")
+    for cycle in (expired_put, expired_call):
+        metadata = json.loads(cycle.detection_metadata)
+        metadata["expiration_date"] = "2020-01-17"
+        cycle.detection_metadata = json.dumps(metadata)
+    db = _FakeSession([expired_put, expired_call])
+
+    WheelPnLCalculator(db).refresh_all_wheel_pnl()
+
+    assert quotes["calls"] == []
+    assert db.updates[1]["current_option_value"] == pytest.approx(1000)
+    assert db.updates[2]["current_option_value"] == pytest.approx(0)
@@ -27,3 +27,59 @@ def test_create_and_delete_wheel_cycle(db):
     assert cycle.ticker == "TEST"
     deleted = WheelService.delete_wheel_cycle(db, cycle.id)
     assert deleted is True
+
+def test_calculate_days_to_expiration_accepts_date_and_datetime_strings():
+    from datetime import date
+    today = date(2025, 1, 10)
+    assert WheelService.calculate_days_to_expiration("2025-01-18", today) == 8
+    assert WheelService.calculate_days_to_expiration("2025-01-18T00:00:00", today) == 8
+    assert WheelService.calculate_days_to_expiration("2025-01-18T00:00:00Z", today) == 8
+    assert WheelService.calculate_days_to_expiration("2024-12-20", today) == 0
+    assert WheelService.calculate_days_to_expiration("not-a-date", today) == 0
+
+def test_bind_call_includes_new_premium_in_lot_metrics(db_session, monkeypatch):
+    from app import crud, models
+    from app.services.wheel_service import WheelService as AppWheelService
+    monkeypatch.setattr(crud, "fetch_yf_price", lambda ticker: None)
+    monkeypatch.setattr(crud, "fetch_latest_price", lambda ticker: None)
+
+    cycle = models.WheelCycle(cycle_key="BIND-1", ticker="BIND", status="Open")
+    db_session.add(cycle)
+    db_session.flush()
+    lot = models.Lot(cycle_id=cycle.id, ticker="BIND", acquisition_method="ASSIGNMENT")
+    evt = models.WheelEvent(cycle_id=cycle.id, event_type="SELL_CALL_OPEN", contracts=1, premium=2.5)
+    db_session.add_all([lot, evt])
+    db_session.commit()
+
+    result, error = AppWheelService.bind_call(db_session, lot.id, evt.id)
+
+    assert error is None and result == {"detail": "Bound"}
+    metrics = db_session.query(models.LotMetrics).filter(models.LotMetrics.lot_id == lot.id).one()
+    assert metrics.net_premiums == 250.0
+    bound_lot = db_session.get(models.Lot, lot.id)
+    assert bound_lot.cost_basis_effective == -2.5
+    assert bound_lot.status == "OPEN_COVERED"
+
+def test_get_lot_links_returns_linked_events_in_date_order(db_session):
+    from datetime import date
+    from app import models
+    from app.services.wheel_service import WheelService as AppWheelService
+
+    cycle = models.WheelCycle(cycle_key="LINKS-1", ticker="LINK", status="Open")
+    db_session.add(cycle)
+    db_session.flush()
+    lot = models.Lot(cycle_id=cycle.id, ticker="LINK", acquisition_method="ASSIGNMENT")
+    later = models.WheelEvent(cycle_id=cycle.id, event_type="SELL_CALL_CLOSE", event_date=date(2025, 2, 1))
+    earlier = models.WheelEvent(cycle_id=cycle.id, event_type="SELL_CALL_OPEN", event_date=date(2025, 1, 2))
+    db_session.add_all([lot, later, earlier])
+    db_session.flush()
+    db_session.add_all([
+        models.LotLink(lot_id=lot.id, linked_object_type="WHEEL_EVENT", linked_object_id=later.id, role="CALL_CLOSE"),
+        models.LotLink(lot_id=lot.id, linked_object_type="WHEEL_EVENT", linked_object_id=earlier.id, role="CALL_OPEN"),
+    ])
+    db_session.commit()
+
+    result = AppWheelService.get_lot_links(db_session, lot.id)
+
+    assert [link.role for link in result["links"]] == ["CALL_CLOSE", "CALL_OPEN"]
+    assert [event.id for event in result["events"]] == [earlier.id, later.id]